@@ -6,7 +6,8 @@ Usage:
     python bescom_json_only.py 3330427000
 
 Outputs:
-    - Writes ONLY one JSON object to stdout (no PDF or other files are created).
+    - Writes ONLY one JSON object to stdout (no PDF or other files are created
+      unless --save is given, which also writes bescom_<account>_structured.json).
     - On error prints diagnostics to stderr and exits non-zero.
 """
 
@@ -15,16 +16,34 @@ import sys
 import json
 import base64
 import hashlib
+import importlib.util
 import argparse
+import functools
+import threading
 import time
 import re
+from bisect import bisect_right
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, List, Tuple
 from io import BytesIO
 
 import requests
-from Crypto.Cipher import AES
-from Crypto.Random import get_random_bytes
+from requests.adapters import HTTPAdapter
+
+# Prefer the OpenSSL-backed `cryptography` package (AES-NI when available),
+# fall back to PyCryptodome if it isn't installed.
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    _HAVE_CRYPTOGRAPHY = True
+except ImportError:
+    from Crypto.Cipher import AES
+    _HAVE_CRYPTOGRAPHY = False
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ---------- Config (env overridable) ----------
 APPSERVICEKEY = os.environ.get(
@@ -37,10 +56,43 @@ SALT_LEN = 32
 IV_LEN = 16
 KEY_LEN = 32
 BLOCK_SIZE = 16
+TAG_LEN = 16
+# "cbc" (what the BESCOM server speaks) or "gcm" (only if both ends are ours).
+CIPHER_MODE = os.environ.get("BESCOM_CIPHER_MODE", "cbc").lower()
+# "hex" (what the BESCOM server expects) or "binary" (versioned base64 frame).
+WIRE_FORMAT = os.environ.get("BESCOM_WIRE_FORMAT", "hex").lower()
+FRAME_CBC = 1
+FRAME_GCM = 2
 
 BASE = os.environ.get("BESCOM_BASE", "https://bescom.co.in:8081")
 DOWNLOAD_URL = BASE + "/bescom/user/v1/downloadBillingDetails"
 
+# Optional on-disk HTTP cache (sqlite path); off unless set, since responses are customer bills.
+HTTP_CACHE_PATH = os.environ.get("BESCOM_HTTP_CACHE", "")
+HTTP_CACHE_TTL = int(os.environ.get("BESCOM_HTTP_CACHE_TTL", "3600"))
+
+def _http_cache_key(request, **kwargs) -> str:
+    # The _cdata body carries a fresh salt/IV per call; key on the decrypted request instead.
+    try:
+        plain = decrypt_cdata(json.loads(request.body)["_cdata"])
+    except Exception:
+        return requests_cache.create_key(request, **kwargs)
+    return hashlib.sha256(request.url.encode() + b"\0" + plain).hexdigest()
+
+# Shared keep-alive session so repeated fetches reuse the TLS connection.
+if HTTP_CACHE_PATH:
+    import requests_cache
+    _SESSION = requests_cache.CachedSession(
+        HTTP_CACHE_PATH,
+        backend="sqlite",
+        expire_after=HTTP_CACHE_TTL,
+        allowable_methods=("POST",),
+        key_fn=_http_cache_key,
+    )
+else:
+    _SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+
 # ---------- Encryption helpers ----------
 def pkcs7_pad(b: bytes) -> bytes:
     pad = BLOCK_SIZE - (len(b) % BLOCK_SIZE)
@@ -56,28 +108,101 @@ def pkcs7_unpad(b: bytes) -> bytes:
         return b
     return b[:-pad]
 
+# hashlib's OpenSSL path already reuses the HMAC ipad/opad state across rounds;
+# the cache only pays off when the same (salt, key) is derived again, e.g. when
+# re-decrypting a retried server response. Fresh encrypts use a random salt.
+@functools.lru_cache(maxsize=256)
 def pbkdf2(password: bytes, salt: bytes, iters: int, dklen: int) -> bytes:
     return hashlib.pbkdf2_hmac("sha1", password, salt, iters, dklen)
 
+def aes_cbc_encrypt(key: bytes, iv: bytes, data: bytes) -> bytes:
+    if _HAVE_CRYPTOGRAPHY:
+        enc = Cipher(algorithms.AES(key), modes.CBC(iv)).encryptor()
+        return enc.update(data) + enc.finalize()
+    return AES.new(key, AES.MODE_CBC, iv).encrypt(data)
+
+@functools.lru_cache(maxsize=32)
+def _ecb_decryptor(key: bytes):
+    """Key-scheduled AES block decryptor, reused for every call with the same key."""
+    if _HAVE_CRYPTOGRAPHY:
+        ctx = Cipher(algorithms.AES(key), modes.ECB()).decryptor()
+        lock = threading.Lock()  # OpenSSL contexts must not be shared across threads
+        def decrypt_blocks(data: bytes) -> bytes:
+            with lock:
+                return ctx.update(data)
+        return decrypt_blocks
+    return AES.new(key, AES.MODE_ECB).decrypt
+
+def aes_cbc_decrypt(key: bytes, iv: bytes, data: bytes) -> bytes:
+    # CBC decryption has no chaining dependency: P_i = D_k(C_i) xor C_(i-1).
+    # Decrypt all blocks with the cached ECB context, then XOR in one go.
+    if len(data) % BLOCK_SIZE:
+        raise ValueError("Ciphertext length is not a multiple of the AES block size")
+    if not data:
+        return b""
+    blocks = _ecb_decryptor(key)(data)
+    prev = iv + data[:-BLOCK_SIZE]
+    return (int.from_bytes(blocks, "big") ^ int.from_bytes(prev, "big")).to_bytes(len(data), "big")
+
+def aes_gcm_encrypt(key: bytes, nonce: bytes, data: bytes) -> Tuple[bytes, bytes]:
+    """Return (ciphertext, tag)."""
+    if _HAVE_CRYPTOGRAPHY:
+        enc = Cipher(algorithms.AES(key), modes.GCM(nonce)).encryptor()
+        ct = enc.update(data) + enc.finalize()
+        return ct, enc.tag
+    return AES.new(key, AES.MODE_GCM, nonce=nonce).encrypt_and_digest(data)
+
+def aes_gcm_decrypt(key: bytes, nonce: bytes, tag: bytes, data: bytes) -> bytes:
+    """Decrypt and verify; raises on a bad tag."""
+    if _HAVE_CRYPTOGRAPHY:
+        dec = Cipher(algorithms.AES(key), modes.GCM(nonce, tag)).decryptor()
+        return dec.update(data) + dec.finalize()
+    return AES.new(key, AES.MODE_GCM, nonce=nonce).decrypt_and_verify(data, tag)
+
+# Wire formats:
+#   hex cbc: hex(salt || iv) + b64(ct)
+#   hex gcm: hex(salt || nonce || tag) + b64(ct)
+#   binary:  b64(version || salt || iv [|| tag] || ct), version FRAME_CBC / FRAME_GCM
+# decrypt_cdata tells them apart by whether the salt/iv header is hex.
+HEX_HEADER_RE = re.compile(r'[0-9a-fA-F]{%d}' % ((SALT_LEN + IV_LEN) * 2))
+
 def encrypt_json(obj: dict, key_str: str = RESPONSE_KEY) -> str:
     plaintext = json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-    salt = get_random_bytes(SALT_LEN)
-    iv = get_random_bytes(IV_LEN)
+    salt = os.urandom(SALT_LEN)
+    iv = os.urandom(IV_LEN)
     key = pbkdf2(key_str.encode("utf-8"), salt, PBKDF2_ITERS, KEY_LEN)
-    cipher = AES.new(key, AES.MODE_CBC, iv)
-    ct = cipher.encrypt(pkcs7_pad(plaintext))
-    return salt.hex() + iv.hex() + base64.b64encode(ct).decode("ascii")
+    if CIPHER_MODE == "gcm":
+        ct, tag = aes_gcm_encrypt(key, iv, plaintext)
+    else:
+        ct, tag = aes_cbc_encrypt(key, iv, pkcs7_pad(plaintext)), b""
+    if WIRE_FORMAT == "binary":
+        version = FRAME_GCM if tag else FRAME_CBC
+        return base64.b64encode(bytes([version]) + salt + iv + tag + ct).decode("ascii")
+    return salt.hex() + iv.hex() + tag.hex() + base64.b64encode(ct).decode("ascii")
 
 def decrypt_cdata(enc: str, key_str: str = RESPONSE_KEY) -> bytes:
-    salt_hex = enc[:SALT_LEN*2]
-    iv_hex = enc[SALT_LEN*2:SALT_LEN*2 + IV_LEN*2]
-    b64_ct = enc[SALT_LEN*2 + IV_LEN*2:]
-    salt = bytes.fromhex(salt_hex)
-    iv = bytes.fromhex(iv_hex)
-    ct = base64.b64decode(b64_ct)
+    if HEX_HEADER_RE.match(enc):
+        salt = bytes.fromhex(enc[:SALT_LEN*2])
+        iv = bytes.fromhex(enc[SALT_LEN*2:SALT_LEN*2 + IV_LEN*2])
+        rest = SALT_LEN*2 + IV_LEN*2
+        gcm = CIPHER_MODE == "gcm"
+        tag = bytes.fromhex(enc[rest:rest + TAG_LEN*2]) if gcm else b""
+        ct = base64.b64decode(enc[rest + len(tag)*2:])
+    else:
+        blob = base64.b64decode(enc)
+        version = blob[0]
+        if version not in (FRAME_CBC, FRAME_GCM):
+            raise ValueError(f"Unknown _cdata frame version {version}")
+        gcm = version == FRAME_GCM
+        salt = blob[1:1 + SALT_LEN]
+        iv = blob[1 + SALT_LEN:1 + SALT_LEN + IV_LEN]
+        rest = 1 + SALT_LEN + IV_LEN
+        tag = blob[rest:rest + TAG_LEN] if gcm else b""
+        ct = blob[rest + len(tag):]
     key = pbkdf2(key_str.encode("utf-8"), salt, PBKDF2_ITERS, KEY_LEN)
-    cipher = AES.new(key, AES.MODE_CBC, iv)
-    pt = cipher.decrypt(ct)
+    if gcm:
+        return aes_gcm_decrypt(key, iv, tag, ct)
+    pt = aes_cbc_decrypt(key, iv, ct)
     return pkcs7_unpad(pt)
 
 # ---------- PDF text extraction from bytes (no disk) ----------
@@ -89,56 +214,108 @@ DATE_RES = [
     re.compile(r'\b([A-Za-z]{3}\s*\d{4})\b'),
 ]
 UNIT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:units|kwh|kw|kW|KWH|units\.)', re.IGNORECASE)
+SPLIT_RE = re.compile(r'\s{2,}|\t')
+DATE_FORMATS = ("%d/%m/%Y","%d/%m/%y","%Y-%m-%d","%b %Y","%B %Y","%b%Y","%b-%Y","%B,%Y")
+DATE_SEPARATORS = "/-, "
 
-def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
-    """Try pdfplumber -> PyPDF2 -> fitz. All operate on bytes in-memory."""
-    # 1) pdfplumber
-    try:
-        import pdfplumber
-        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
-            pages = [p.extract_text() or "" for p in pdf.pages]
-        if any(pages):
-            return "\n\n".join(pages)
-    except Exception:
-        pass
+@functools.lru_cache(maxsize=None)
+def _date_formats_for_shape(starts_digit: bool, starts_alpha: bool, seps: str) -> Tuple[str, ...]:
+    """DATE_FORMATS (in order) minus the ones that cannot match this shape."""
+    out = []
+    for fmt in DATE_FORMATS:
+        if starts_digit and fmt[1] in "bB":
+            continue
+        if starts_alpha and fmt[1] in "dmYy":
+            continue
+        literals = re.sub(r"%.", "", fmt)
+        if any(c not in seps for c in literals):
+            continue
+        out.append(fmt)
+    return tuple(out)
 
-    # 2) PyPDF2
-    try:
-        import PyPDF2
-        reader = PyPDF2.PdfReader(BytesIO(pdf_bytes))
-        pages = []
-        for p in reader.pages:
-            pages.append(p.extract_text() or "")
-        if any(pages):
-            return "\n\n".join(pages)
-    except Exception:
-        pass
+def date_formats_for(date_str: str) -> Tuple[str, ...]:
+    """Pick candidate strptime formats up front instead of eating a ValueError per miss."""
+    seps = "".join(c for c in DATE_SEPARATORS
+                   if (c in date_str if c != " " else any(ch.isspace() for ch in date_str)))
+    first = date_str[:1]
+    return _date_formats_for_shape(first.isdigit(), first.isalpha(), seps)
 
-    # 3) fitz / PyMuPDF
-    try:
-        import fitz
-        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-        pages = [p.get_text("text") or "" for p in doc]
+def _extract_fitz(pdf_bytes: bytes) -> List[str]:
+    import fitz
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return [p.get_text("text") or "" for p in doc]
+
+def _extract_pdfplumber(pdf_bytes: bytes) -> List[str]:
+    import pdfplumber
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        return [p.extract_text() or "" for p in pdf.pages]
+
+def _extract_pypdf2(pdf_bytes: bytes) -> List[str]:
+    import PyPDF2
+    reader = PyPDF2.PdfReader(BytesIO(pdf_bytes))
+    return [p.extract_text() or "" for p in reader.pages]
+
+PDF_EXTRACTORS = {
+    "fitz": _extract_fitz,
+    "pdfplumber": _extract_pdfplumber,
+    "PyPDF2": _extract_pypdf2,
+}
+# Resolved once at import, fastest first (MuPDF is C, pdfplumber builds a full
+# layout model), so missing libraries never cost an ImportError per call.
+PDF_BACKENDS = tuple(name for name in PDF_EXTRACTORS if importlib.util.find_spec(name) is not None)
+
+def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
+    """Try fitz -> pdfplumber -> PyPDF2. All operate on bytes in-memory."""
+    for name in PDF_BACKENDS:
+        try:
+            pages = PDF_EXTRACTORS[name](pdf_bytes)
+        except Exception:
+            continue
         if any(pages):
             return "\n\n".join(pages)
-    except Exception:
-        pass
 
-    raise RuntimeError("No available PDF text extractor succeeded. Install pdfplumber, PyPDF2 or pymupdf.")
+    raise RuntimeError("No available PDF text extractor succeeded. Install pymupdf, pdfplumber or PyPDF2.")
 
 # ---------- Heuristics for rows ----------
+@dataclass(slots=True)
+class RowCandidate:
+    """A row guessed from the PDF text; `line` for free text, `raw_cols` for table rows."""
+    date: Optional[str]
+    units: Optional[float]
+    amount: Optional[float]
+    line: Optional[str] = None
+    raw_cols: Optional[List[str]] = None
+
+_NUM_STRIP = str.maketrans('', '', ',\u202F')
+
 def normalize_num(s):
     if s is None:
         return None
-    s = s.replace('\u202F','').replace(',','').strip()
+    s = s.translate(_NUM_STRIP).strip()
+    # Fast path for the "1234" / "1234.50" shapes AMOUNT_RE produces: no exceptions.
+    if s.isdecimal():
+        return int(s)
+    head, dot, tail = s.partition('.')
+    if dot and head.isdecimal() and tail.isdecimal():
+        return float(s)
     try:
         return int(s) if '.' not in s else float(s)
-    except:
+    except ValueError:
         try:
             return float(s)
-        except:
+        except ValueError:
             return None
 
+COL_SEP = " | "
+
+def _col_starts(cols: List[str]) -> List[int]:
+    starts = []
+    pos = 0
+    for c in cols:
+        starts.append(pos)
+        pos += len(c) + len(COL_SEP)
+    return starts
+
 def find_table_by_header(lines: List[str]):
     headers_keywords = ["bill date", "bill period", "amount", "units", "consumed", "bill amount", "net amount", "bill month", "month", "bill"]
     header_idx = None
@@ -154,17 +331,17 @@ def find_table_by_header(lines: List[str]):
     for ln in lines[header_idx+1: header_idx+1+200]:
         if not ln.strip():
             break
-        cols = re.split(r'\s{2,}|\t', ln.strip())
+        cols = SPLIT_RE.split(ln.strip())
         if len(cols) < 2:
             cols = ln.strip().split()
         data_rows.append(cols)
     mapped = []
+    findall_amounts = AMOUNT_RE.findall
     for cols in data_rows:
-        nums = []
-        for c in cols:
-            m = AMOUNT_RE.findall(c)
-            if m:
-                nums.extend(m)
+        # No pattern can match across " | ", so one scan of the joined row
+        # finds exactly what scanning each column separately would.
+        joined = COL_SEP.join(cols)
+        nums = findall_amounts(joined)
         if not nums:
             continue
         amt = normalize_num(nums[-1])
@@ -173,32 +350,55 @@ def find_table_by_header(lines: List[str]):
             candidate = normalize_num(nums[-2])
             if candidate is not None and candidate < 10000:
                 unit = candidate
+        # First column with any date wins, then DATE_RES order within it
         date = None
-        for c in cols:
-            for dr in DATE_RES:
-                m = dr.findall(c)
-                if m:
-                    date = m[0]
-                    break
-            if date:
-                break
-        mapped.append({"raw_cols": cols, "date": date, "units": unit, "amount": amt})
+        best = None
+        col_starts = None
+        for pi, dr in enumerate(DATE_RES):
+            m = dr.search(joined)
+            if m:
+                if col_starts is None:
+                    col_starts = _col_starts(cols)
+                key = (bisect_right(col_starts, m.start()), pi)
+                if best is None or key < best:
+                    best, date = key, m.group(1)
+        mapped.append(RowCandidate(date=date, units=unit, amount=amt, raw_cols=cols))
     return mapped if mapped else None
 
+# Joins cleaned lines into one buffer so each pattern scans the text once.
+# NUL is neither whitespace, a word char nor a digit, so no pattern can match
+# across it and \b / (?<!\d) behave exactly as at a line start or end.
+LINE_SEP = "\x00"
+
+def _findall_by_line(pattern: "re.Pattern", text: str, starts: List[int]) -> dict:
+    """Like pattern.findall per line, but one finditer over the joined text."""
+    by_line: dict = {}
+    for m in pattern.finditer(text):
+        by_line.setdefault(bisect_right(starts, m.start()) - 1, []).append(m.group(1))
+    return by_line
+
 def guess_rows_from_lines(lines: List[str]):
     rows = []
-    for ln in lines:
-        ln_clean = " ".join(ln.split())
+    cleaned = [" ".join(ln.split()) for ln in lines]
+    starts: List[int] = []
+    pos = 0
+    for ln_clean in cleaned:
+        starts.append(pos)
+        pos += len(ln_clean) + 1
+    text = LINE_SEP.join(cleaned)
+    amounts_by_line = _findall_by_line(AMOUNT_RE, text, starts)
+    dates_by_line = [_findall_by_line(dr, text, starts) for dr in DATE_RES]
+    units_by_line = _findall_by_line(UNIT_RE, text, starts)
+    for i, ln_clean in enumerate(cleaned):
         if not ln_clean:
             continue
-        amounts = AMOUNT_RE.findall(ln_clean)
-        amounts = [a for a in amounts if len(a) <= 20]
+        amounts = [a for a in amounts_by_line.get(i, ()) if len(a) <= 20]
         dates = []
-        for dr in DATE_RES:
-            for m in dr.findall(ln_clean):
+        for by_line in dates_by_line:
+            for m in by_line.get(i, ()):
                 if m and len(m) < 40:
                     dates.append(m.strip())
-        units = UNIT_RE.findall(ln_clean)
+        units = units_by_line.get(i, [])
         if amounts and (dates or units or len(amounts) >= 2):
             amt = normalize_num(amounts[-1])
             unit_val = None
@@ -211,43 +411,43 @@ def guess_rows_from_lines(lines: List[str]):
                 if len(amounts) >= 2:
                     unit_val = normalize_num(amounts[-2])
             date_val = dates[0] if dates else None
-            rows.append({
-                "line": ln_clean,
-                "date": date_val,
-                "units": unit_val,
-                "amount": amt
-            })
+            rows.append(RowCandidate(date=date_val, units=unit_val, amount=amt, line=ln_clean))
     return rows
 
 def parse_pdf_bytes_to_rows(pdf_bytes: bytes):
     txt = extract_text_from_pdf_bytes(pdf_bytes)
-    lines: List[str] = []
-    for page in txt.split("\n\n"):
-        for ln in page.splitlines():
-            lines.append(ln.strip())
+    # Splitting on the "\n\n" page joins first keeps page boundaries from
+    # showing up as blank lines, which would end find_table_by_header early.
+    lines = [ln.strip() for page in txt.split("\n\n") for ln in page.splitlines()]
     table = find_table_by_header(lines)
     rows = table if table else guess_rows_from_lines(lines)
     out_rows = []
     for r in rows:
-        date = r.get("date")
-        units = r.get("units")
-        amount = r.get("amount")
+        date = r.date
+        units = r.units
+        amount = r.amount
+        # Only rescan the raw text when the row heuristics left a field empty
+        if amount is None or units is None:
+            fallback_text = r.line if r.line is not None else " ".join(r.raw_cols or [])
+            if amount is None:
+                m = AMOUNT_RE.findall(fallback_text)
+                if m:
+                    amount = normalize_num(m[-1])
+            if units is None:
+                m = UNIT_RE.findall(fallback_text)
+                if m:
+                    try:
+                        units = float(m[0])
+                    except:
+                        units = None
         if amount is None:
-            m = AMOUNT_RE.findall(r.get("line","") if "line" in r else " ".join(r.get("raw_cols",[])))
-            if m:
-                amount = normalize_num(m[-1])
-        if units is None:
-            m = UNIT_RE.findall(r.get("line","") if "line" in r else " ".join(r.get("raw_cols", [])))
-            if m:
-                try:
-                    units = float(m[0])
-                except:
-                    units = None
+            continue  # rows without an amount are dropped
         parsed_date = None
         if date:
-            for fmt in ("%d/%m/%Y","%d/%m/%y","%Y-%m-%d","%b %Y","%B %Y","%b%Y","%b-%Y","%B,%Y"):
+            date_clean = date.replace(',',' ').strip()
+            for fmt in date_formats_for(date_clean):
                 try:
-                    parsed_date = datetime.strptime(date.replace(',',' ').strip(), fmt).date().isoformat()
+                    parsed_date = datetime.strptime(date_clean, fmt).date().isoformat()
                     break
                 except:
                     continue
@@ -257,10 +457,8 @@ def parse_pdf_bytes_to_rows(pdf_bytes: bytes):
             "date": parsed_date,
             "units": units,
             "amount": amount,
-            "raw": r.get("line") if "line" in r else " | ".join(r.get("raw_cols", []))
+            "raw": r.line if r.line is not None else COL_SEP.join(r.raw_cols or [])
         })
-    # keep only rows that have amount
-    out_rows = [r for r in out_rows if r.get("amount") is not None]
     return out_rows
 
 # ---------- Fetch & decrypt (no disk writes) ----------
@@ -274,22 +472,24 @@ def fetch_and_decrypt(account: str, verbose: bool=False) -> bytes:
         "Origin": "https://www.bescom.co.in",
         "Referer": "https://www.bescom.co.in/"
     }
-    r = requests.post(DOWNLOAD_URL, json={"_cdata": enc}, headers=headers, timeout=30)
+    r = _SESSION.post(DOWNLOAD_URL, json={"_cdata": enc}, headers=headers, timeout=30)
     r.raise_for_status()
-    # expect JSON with _cdata
+    # expect JSON with _cdata; parse from the raw bytes rather than r.text,
+    # which charset-sniffs and decodes the whole body
+    body = r.content
     content_type = r.headers.get("content-type","").lower()
     resp_json = None
-    if content_type.startswith("application/json") or r.text.strip().startswith("{"):
+    if content_type.startswith("application/json") or body.lstrip()[:1] == b"{":
         try:
-            resp_json = r.json()
+            resp_json = json.loads(body)
         except Exception:
             resp_json = None
     if not resp_json or "_cdata" not in resp_json:
         # If response body itself looks like _cdata string, try decrypting that directly
-        body_text = r.text.strip()
-        if body_text and len(body_text) > (SALT_LEN*2 + IV_LEN*2 + 8):
+        body_stripped = body.strip()
+        if body_stripped and len(body_stripped) > (SALT_LEN*2 + IV_LEN*2 + 8):
             try:
-                dec = decrypt_cdata(body_text)
+                dec = decrypt_cdata(body_stripped.decode("ascii"))
                 return dec
             except Exception:
                 pass
@@ -303,10 +503,9 @@ def fetch_and_decrypt(account: str, verbose: bool=False) -> bytes:
         if isinstance(parsed, dict) and parsed.get("data"):
             # data is likely base64 string of PDF
             b64 = "".join(parsed["data"].split())
-            try:
-                pdf_bytes = base64.b64decode(b64, validate=True)
-            except Exception:
-                pdf_bytes = base64.b64decode(b64 + "===")
+            # pad once up front instead of retrying a failed strict decode
+            b64 += "=" * (-len(b64) % 4)
+            pdf_bytes = base64.b64decode(b64)
             return pdf_bytes
     except Exception:
         pass
@@ -320,10 +519,33 @@ def fetch_and_decrypt(account: str, verbose: bool=False) -> bytes:
     raise RuntimeError("Decrypted content did not contain PDF bytes or expected base64 'data' field.")
 
 # ---------- CLI ----------
+def dumps_pretty(obj) -> str:
+    """Indented JSON; orjson when installed (handles datetime natively), else json."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=2, default=str)
+
+def structured_result(account: str, rows: List[dict]) -> dict:
+    return {
+        "account": account,
+        "fetched_at": datetime.utcnow().isoformat() + "Z",
+        "rows": rows
+    }
+
+def scrape_account(account: str, verbose: bool = False) -> dict:
+    """
+    Fetch and parse one account in-process; returns the same structure the CLI prints.
+    Raises on fetch/parse failure instead of exiting.
+    """
+    acct = account.strip()
+    pdf_bytes = fetch_and_decrypt(acct, verbose=verbose)
+    return structured_result(acct, parse_pdf_bytes_to_rows(pdf_bytes))
+
 def main():
     p = argparse.ArgumentParser(description="Fetch BESCOM billing for account and print structured JSON to stdout (only).")
     p.add_argument("account", help="ConsumerAccountId, e.g. 3330427000")
     p.add_argument("--verbose", "-v", action="store_true", help="Print diagnostics to stderr")
+    p.add_argument("--save", action="store_true", help="Also write bescom_<account>_structured.json")
     args = p.parse_args()
 
     acct = args.account.strip()
@@ -339,19 +561,16 @@ def main():
         print(json.dumps({"error": "parse_failed", "message": str(e)}), file=sys.stderr)
         sys.exit(3)
 
-    structured = {
-        "account": acct,
-        "fetched_at": datetime.utcnow().isoformat() + "Z",
-        "rows": rows
-    }
+    structured = structured_result(acct, rows)
 
     # Print ONLY the JSON object to stdout (no other prints)
-    sys.stdout.write(json.dumps(structured, ensure_ascii=False, indent=2, default=str))
+    sys.stdout.write(dumps_pretty(structured))
     sys.stdout.flush()
 
-    #Save the JSON
-    with open(f"bescom_{acct}_structured.json", "w", encoding="utf-8") as f:
-        json.dump(structured, f, ensure_ascii=False, indent=2, default=str)
+    # Opt-in file copy; stdout already carries the indented version
+    if args.save:
+        with open(f"bescom_{acct}_structured.json", "w", encoding="utf-8") as f:
+            json.dump(structured, f, ensure_ascii=False, default=str)
 
 if __name__ == "__main__":
     main()
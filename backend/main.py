@@ -5,38 +5,27 @@ Provides APIs for rainwater harvesting and comprehensive solar power analysis wi
 
 import traceback
 from urllib.parse import parse_qs
-from fastapi import FastAPI, HTTPException, UploadFile, File, Query, logger
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query
+from fastapi.logger import logger
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from mangum import Mangum
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
-import io
 import base64
 import json
 import asyncio
-import subprocess
 import os
+import functools
 from concurrent.futures import ThreadPoolExecutor
-from PIL import Image
-import cv2
-import numpy as np
-from datetime import datetime, timedelta
-import uvicorn
-import statistics
-import pandas as pd
+from cachetools import TTLCache
 import numpy as np
+from datetime import datetime, timezone
 
 # Import our custom modules
-from rooftop_detection import (
-    get_roof_data, 
-    get_solar_data, 
-    get_rainwater_data
-)
-from rainwater import rainwater_report
-from bescom_scraper import main as bescom_main
-import sys
-from io import StringIO
+# (rooftop_detection/rainwater pull in OpenCV, shapely and pandas; they are
+# imported inside the endpoints that use them to keep process start-up light)
+from bescom_scraper import scrape_account
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -44,9 +33,45 @@ app = FastAPI(
     description="API for rainwater harvesting and comprehensive solar power analysis with BESCOM integration",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
+# Shared pool for blocking work (CV passes, BESCOM scrape); asyncio.to_thread uses it once installed.
+# Built per lifespan so a second startup in the same process gets a live pool; on Lambda
+# (lifespan="off") it is never installed and the loop keeps its own default executor
+EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+@app.on_event("startup")
+async def install_executor():
+    global EXECUTOR
+    EXECUTOR = ThreadPoolExecutor(
+        max_workers=int(os.getenv("NEOLECTRA_POOL", "32")),
+        thread_name_prefix="neolectra"
+    )
+    asyncio.get_running_loop().set_default_executor(EXECUTOR)
+
+def warm_up_analysis():
+    # Pay the deferred imports and first-call CV setup before serving traffic
+    from rooftop_detection import warm_up
+    import rainwater  # noqa: F401
+    
+    try:
+        warm_up()
+    except Exception as e:
+        logger.warning(f"Analysis warm-up failed: {e}")
+
+@app.on_event("startup")
+async def warm_up_on_startup():
+    await asyncio.to_thread(warm_up_analysis)
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    global EXECUTOR
+    if EXECUTOR is not None:
+        EXECUTOR.shutdown(wait=True)
+        EXECUTOR = None
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -126,60 +151,112 @@ class HealthResponse(BaseModel):
     timestamp: str
     version: str
 
+# Static lookup tables, built once at import
+
+ROOF_TYPES_RESPONSE = {
+    "success": True,
+    "message": "Available roof types retrieved successfully",
+    "roof_types": [
+        {"value": "concrete", "label": "Concrete", "coefficient": 0.80},
+        {"value": "tile", "label": "Tile", "coefficient": 0.70},
+        {"value": "metal", "label": "Metal", "coefficient": 0.90},
+        {"value": "cgi", "label": "CGI (Corrugated Galvanized Iron)", "coefficient": 0.90},
+        {"value": "asbestos", "label": "Asbestos", "coefficient": 0.80},
+        {"value": "custom", "label": "Custom", "coefficient": None}
+    ]
+}
+
+# Panel specifications (typical values) per panel model chosen by get_solar_data
+_PANEL_COMMON_SPECS = {
+    "panel_type": "Monocrystalline Silicon",
+    "efficiency": "20-22%",
+    "warranty_years": 25,
+    "degradation_rate": "0.8% per year"
+}
+
+PANEL_SPECS = {
+    "small": {**_PANEL_COMMON_SPECS, "power_per_panel_w": 390, "panel_dimensions": "1.95m x 1.0m", "model": "small"},
+    "medium": {**_PANEL_COMMON_SPECS, "power_per_panel_w": 520, "panel_dimensions": "2.278m x 1.134m", "model": "medium"},
+    "large": {**_PANEL_COMMON_SPECS, "power_per_panel_w": 650, "panel_dimensions": "2.384m x 1.303m", "model": "large"}
+}
+
 # Utility functions
 
 def image_to_base64(image: np.ndarray) -> str:
-    """Convert OpenCV image to base64 string"""
-    if len(image.shape) == 3:
-        # Color image
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        pil_image = Image.fromarray(image_rgb)
-    else:
-        # Grayscale image
-        pil_image = Image.fromarray(image)
+    """Convert OpenCV image (BGR or grayscale) to base64 PNG string"""
+    import cv2
     
-    buffer = io.BytesIO()
-    pil_image.save(buffer, format="PNG")
-    image_base64 = base64.b64encode(buffer.getvalue()).decode()
-    return image_base64
+    ok, buffer = cv2.imencode(".png", image)
+    if not ok:
+        raise ValueError("Failed to encode image as PNG")
+    return base64.b64encode(buffer).decode("ascii")
+
+def dataframe_records(df) -> List[Dict[str, Any]]:
+    """Column-wise DataFrame -> JSON-ready records (datetimes as ISO strings, numpy scalars as Python)"""
+    columns = {}
+    for name in df.columns:
+        values = df[name].to_numpy()
+        if values.dtype.kind == "M":
+            columns[name] = np.datetime_as_string(values, unit="s").tolist()
+        else:
+            columns[name] = values.tolist()
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
 
-def validate_image(file: UploadFile) -> Image.Image:
-    """Validate and convert uploaded file to PIL Image"""
+async def validate_image(file: UploadFile) -> np.ndarray:
+    """Validate uploaded file and decode it straight to an OpenCV BGR array"""
     if not file.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail="File must be an image")
     
+    import cv2
+    
     try:
-        contents = file.file.read()
-        image = Image.open(io.BytesIO(contents))
-        return image
+        contents = await file.read()
+        # Keep pixels as stored (no EXIF rotation), matching the previous PIL decode
+        image = cv2.imdecode(
+            np.frombuffer(contents, np.uint8),
+            cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid image file: {str(e)}")
+    
+    if image is None:
+        raise HTTPException(status_code=400, detail="Invalid image file: could not decode image")
+    return image
+
+# Recent scrapes per account; concurrent callers for one account share a single
+# in-flight scrape task (and its result or exception)
+BESCOM_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+_BESCOM_INFLIGHT: Dict[str, asyncio.Task] = {}
 
-def run_bescom_scraper(account_id: str) -> Dict[str, Any]:
-    """Run BESCOM scraper and return parsed data"""
+async def _scrape_and_cache(account_id: str) -> Dict[str, Any]:
     try:
-        # Run the BESCOM scraper as a subprocess to avoid stdout capture issues
-        result = subprocess.run(
-            [sys.executable, "bescom_scraper.py", account_id],
-            capture_output=True,
-            text=True,
-            timeout=60,
-            cwd=os.path.dirname(os.path.abspath(__file__))
-        )
-        
-        if result.returncode != 0:
-            raise Exception(f"BESCOM scraper failed: {result.stderr}")
-        
-        # Parse the JSON output
-        billing_data = json.loads(result.stdout)
-        return billing_data
-    
-    except subprocess.TimeoutExpired:
-        raise Exception("BESCOM scraper timed out")
-    except json.JSONDecodeError:
-        raise Exception("Failed to parse BESCOM response")
+        billing_data = await asyncio.to_thread(scrape_account, account_id)
     except Exception as e:
         raise Exception(f"Error running BESCOM scraper: {str(e)}")
+    BESCOM_CACHE[account_id] = billing_data
+    return billing_data
+
+def _forget_inflight(account_id: str, task: asyncio.Task) -> None:
+    # Dropped once the scrape settles, so a failure is not reused and the next call retries
+    if _BESCOM_INFLIGHT.get(account_id) is task:
+        del _BESCOM_INFLIGHT[account_id]
+    if not task.cancelled():
+        task.exception()  # retrieved here too in case every awaiting caller went away
+
+async def run_bescom_scraper(account_id: str) -> Dict[str, Any]:
+    """Run BESCOM scraper in-process on a worker thread and return parsed data (cached per account)"""
+    account_id = account_id.strip()
+    billing_data = BESCOM_CACHE.get(account_id)
+    if billing_data is not None:
+        return billing_data
+    
+    task = _BESCOM_INFLIGHT.get(account_id)
+    if task is None:
+        task = asyncio.create_task(_scrape_and_cache(account_id))
+        _BESCOM_INFLIGHT[account_id] = task
+        task.add_done_callback(functools.partial(_forget_inflight, account_id))
+    # shield: one caller disconnecting must not cancel the scrape the others are awaiting
+    return await asyncio.shield(task)
 
 def analyze_bescom_data(billing_data: Dict[str, Any]) -> BESCOMAnalysis:
     """Analyze BESCOM billing data to extract insights"""
@@ -188,40 +265,40 @@ def analyze_bescom_data(billing_data: Dict[str, Any]) -> BESCOMAnalysis:
     if not rows:
         raise ValueError("No billing data available for analysis")
     
-    # Extract units and amounts
-    monthly_data = []
-    for row in rows:
-        if row.get("units") is not None and row.get("amount") is not None:
-            monthly_data.append({
-                "date": row.get("date"),
-                "units": float(row["units"]),
-                "amount": float(row["amount"]),
-                "cost_per_unit": float(row["amount"]) / float(row["units"]) if float(row["units"]) > 0 else 0
-            })
+    # Extract (date, units, amount) for rows that have both figures
+    monthly_data = [
+        (row.get("date"), float(row["units"]), float(row["amount"]))
+        for row in rows
+        if row.get("units") is not None and row.get("amount") is not None
+    ]
     
     if not monthly_data:
         raise ValueError("No valid billing data found")
     
     # Sort by date (newest first)
-    monthly_data.sort(key=lambda x: x["date"] or "", reverse=True)
+    monthly_data.sort(key=lambda x: x[0] or "", reverse=True)
     
-    # Calculate statistics
-    units_list = [data["units"] for data in monthly_data]
-    amounts_list = [data["amount"] for data in monthly_data]
-    cost_per_unit_list = [data["cost_per_unit"] for data in monthly_data if data["cost_per_unit"] > 0]
+    # Calculate statistics on parallel arrays in the sorted order
+    count = len(monthly_data)
+    dates = [data[0] for data in monthly_data]
+    values = np.array([data[1:] for data in monthly_data], dtype=np.float64)
+    units = values[:, 0]
+    amounts = values[:, 1]
+    cost_per_unit = np.divide(amounts, units, out=np.zeros(count), where=units > 0)
+    positive_cost_per_unit = cost_per_unit[cost_per_unit > 0]
     
-    avg_units = statistics.mean(units_list)
-    avg_amount = statistics.mean(amounts_list)
-    avg_cost_per_unit = statistics.mean(cost_per_unit_list) if cost_per_unit_list else 0
+    avg_units = float(units.mean())
+    avg_amount = float(amounts.mean())
+    avg_cost_per_unit = float(positive_cost_per_unit.mean()) if positive_cost_per_unit.size else 0
     
     # Find peak and lowest consumption
-    max_consumption = max(monthly_data, key=lambda x: x["units"])
-    min_consumption = min(monthly_data, key=lambda x: x["units"])
+    peak_date = dates[int(units.argmax())]
+    lowest_date = dates[int(units.argmin())]
     
     # Calculate trend (simple linear trend)
-    if len(units_list) >= 3:
-        recent_avg = statistics.mean(units_list[:3])  # Last 3 months
-        older_avg = statistics.mean(units_list[-3:])  # Oldest 3 months
+    if count >= 3:
+        recent_avg = units[:3].mean()  # Last 3 months
+        older_avg = units[-3:].mean()  # Oldest 3 months
         
         if recent_avg > older_avg * 1.1:
             trend = "increasing"
@@ -235,10 +312,10 @@ def analyze_bescom_data(billing_data: Dict[str, Any]) -> BESCOMAnalysis:
     return BESCOMAnalysis(
         average_monthly_units=round(avg_units, 2),
         average_monthly_bill=round(avg_amount, 2),
-        peak_consumption_month=max_consumption["date"] or "Unknown",
-        lowest_consumption_month=min_consumption["date"] or "Unknown",
-        yearly_total_units=round(sum(units_list), 2),
-        yearly_total_cost=round(sum(amounts_list), 2),
+        peak_consumption_month=peak_date or "Unknown",
+        lowest_consumption_month=lowest_date or "Unknown",
+        yearly_total_units=round(float(units.sum()), 2),
+        yearly_total_cost=round(float(amounts.sum()), 2),
         consumption_trend=trend,
         cost_per_unit_avg=round(avg_cost_per_unit, 2)
     )
@@ -273,11 +350,10 @@ def calculate_solar_roi(solar_data: Dict[str, Any], bescom_analysis: BESCOMAnaly
     total_maintenance_25_years = maintenance_cost_annual * system_life_years
     
     # Degradation factor (panels lose about 0.8% efficiency per year)
+    # Yearly output is a geometric series in the retained efficiency r
     degradation_rate = 0.008
-    total_energy_25_years = 0
-    for year in range(system_life_years):
-        efficiency_factor = (1 - degradation_rate) ** year
-        total_energy_25_years += annual_energy_kwh * efficiency_factor
+    r = 1 - degradation_rate
+    total_energy_25_years = annual_energy_kwh * (1 - r ** system_life_years) / (1 - r)
     
     total_savings_25_years = total_energy_25_years * avg_cost_per_unit
     net_savings_25_years = total_savings_25_years - initial_investment - total_maintenance_25_years
@@ -293,14 +369,18 @@ def calculate_solar_roi(solar_data: Dict[str, Any], bescom_analysis: BESCOMAnaly
         break_even_month=break_even_month
     )
 
+# CO2 emission factor for Indian grid: ~0.82 kg CO2/kWh
+CO2_FACTOR = 0.82
+# One tree absorbs approximately 21 kg of CO2 per year
+TREE_CO2_KG_YEAR = 21
+
 def calculate_environmental_impact(annual_energy_kwh: float) -> Dict[str, Any]:
     """Calculate environmental impact of solar installation"""
-    # CO2 emission factor for Indian grid: ~0.82 kg CO2/kWh
-    co2_emission_factor = 0.82
-    co2_offset_per_year = annual_energy_kwh * co2_emission_factor
+    if annual_energy_kwh <= 0:
+        return {"co2_offset_kg_per_year": 0.0, "trees_equivalent": 0}
     
-    # One tree absorbs approximately 21 kg of CO2 per year
-    trees_equivalent = int(co2_offset_per_year / 21)
+    co2_offset_per_year = annual_energy_kwh * CO2_FACTOR
+    trees_equivalent = int(co2_offset_per_year / TREE_CO2_KG_YEAR)
     
     return {
         "co2_offset_kg_per_year": round(co2_offset_per_year, 2),
@@ -309,23 +389,21 @@ def calculate_environmental_impact(annual_energy_kwh: float) -> Dict[str, Any]:
 
 # API Routes
 
+# Constant part of the health payload; only the timestamp changes per call
+HEALTH_TEMPLATE = {"status": "healthy", "version": "1.0.0"}
+
+def health_payload() -> ORJSONResponse:
+    return ORJSONResponse({**HEALTH_TEMPLATE, "timestamp": datetime.now(timezone.utc).isoformat()})
+
 @app.get("/", response_model=HealthResponse)
 async def root():
     """Health check endpoint"""
-    return HealthResponse(
-        status="healthy",
-        timestamp=datetime.utcnow().isoformat(),
-        version="1.0.0"
-    )
+    return health_payload()
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Detailed health check endpoint"""
-    return HealthResponse(
-        status="healthy",
-        timestamp=datetime.utcnow().isoformat(),
-        version="1.0.0"
-    )
+    return health_payload()
 
 @app.post("/api/solar/analyze", response_model=SolarAnalysisResponse)
 async def analyze_solar_potential(
@@ -335,108 +413,105 @@ async def analyze_solar_potential(
     """
     Analyze solar panel potential from uploaded rooftop image with optional BESCOM integration
     """
-    try:
-        # Validate and process image
-        image = validate_image(file)
-        
-        # Run solar analysis and BESCOM scraping in parallel if account ID provided
-        async def run_analysis():
-            # Get solar analysis data
-            solar_data = get_solar_data(image)
-            roof_data = get_roof_data(image)
-            
-            # Initialize BESCOM analysis variables
-            bescom_analysis = None
-            roi_analysis = None
-            energy_offset_percentage = None
-            
-            # If BESCOM account ID is provided, run BESCOM analysis in parallel
-            if bescom_account_id:
-                try:
-                    # Run BESCOM scraper
-                    billing_data = run_bescom_scraper(bescom_account_id)
-                    
-                    # Analyze BESCOM data
-                    bescom_analysis = analyze_bescom_data(billing_data)
-                    
-                    # Calculate ROI
-                    roi_analysis = calculate_solar_roi(solar_data, bescom_analysis)
-                    
-                    # Calculate energy offset percentage
-                    annual_consumption_kwh = bescom_analysis.average_monthly_units * 12
-                    if annual_consumption_kwh > 0:
-                        energy_offset_percentage = min(100.0, (solar_data.get("annual_energy_kwh", 0) / annual_consumption_kwh) * 100)
-                    
-                except Exception as bescom_error:
-                    print(f"BESCOM analysis failed: {bescom_error}")
-                    # Continue without BESCOM analysis
-            
-            return solar_data, roof_data, bescom_analysis, roi_analysis, energy_offset_percentage
-        
-        # Execute analysis
-        solar_data, roof_data, bescom_analysis, roi_analysis, energy_offset_percentage = await run_analysis()
-        
-        # Calculate efficiency
-        panel_efficiency = 0.0
-        if roof_data["roof_area"] > 0:
-            panel_efficiency = (solar_data["area_of_panels"] / roof_data["roof_area"]) * 100
+    from rooftop_detection import get_roof_data, get_solar_data
+    
+    # Validate and process image
+    image = await validate_image(file)
+    
+    # Run solar analysis and BESCOM scraping in parallel if account ID provided
+    async def run_analysis():
+        # CV passes run on worker threads; the BESCOM scrape overlaps with them
+        async def roof_then_solar():
+            # the layout reuses this roof estimate instead of computing it a second time
+            roof_data = await asyncio.to_thread(get_roof_data, image)
+            solar_data = await asyncio.to_thread(get_solar_data, image, roof_data)
+            return solar_data, roof_data
         
-        # Convert result image to base64
-        image_base64 = None
-        if solar_data.get("image_with_panels") is not None:
-            image_base64 = image_to_base64(solar_data["image_with_panels"])
+        tasks = [roof_then_solar()]
+        if bescom_account_id:
+            tasks.append(run_bescom_scraper(bescom_account_id))
         
-        # Calculate environmental impact
-        env_impact = calculate_environmental_impact(solar_data.get("annual_energy_kwh", 0))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        if isinstance(results[0], BaseException):
+            raise results[0]
+        solar_data, roof_data = results[0]
         
-        # Panel specifications (typical values)
-        # Get panel specifications from the solar_data returned by get_solar_data
-        # This ensures we use the actual panel model selected during analysis
-        panel_model = solar_data.get("panel_model", "medium")
+        # Initialize BESCOM analysis variables
+        bescom_analysis = None
+        roi_analysis = None
+        energy_offset_percentage = None
         
-        # Set specifications based on the panel model
-        if panel_model == "small":
-            power_per_panel = 390
-            dimensions = "1.95m x 1.0m"
-        elif panel_model == "large":
-            power_per_panel = 650
-            dimensions = "2.384m x 1.303m"
-        else:  # medium (default)
-            power_per_panel = 520
-            dimensions = "2.278m x 1.134m"
+        if bescom_account_id:
+            try:
+                billing_data = results[1]
+                if isinstance(billing_data, BaseException):
+                    raise billing_data
+                
+                # Analyze BESCOM data
+                bescom_analysis = analyze_bescom_data(billing_data)
+                
+                # Calculate ROI
+                roi_analysis = calculate_solar_roi(solar_data, bescom_analysis)
+                
+                # Calculate energy offset percentage
+                annual_consumption_kwh = bescom_analysis.average_monthly_units * 12
+                if annual_consumption_kwh > 0:
+                    energy_offset_percentage = min(100.0, (solar_data.get("annual_energy_kwh", 0) / annual_consumption_kwh) * 100)
             
-        panel_specs = {
-            "panel_type": "Monocrystalline Silicon",
-            "efficiency": "20-22%",
-            "warranty_years": 25,
-            "degradation_rate": "0.8% per year",
-            "power_per_panel_w": power_per_panel,
-            "panel_dimensions": dimensions,
-            "model": panel_model
-        }
-        
-        return SolarAnalysisResponse(
-            roof_area=roof_data["roof_area"],
-            panel_area=solar_data["area_of_panels"],
-            num_panels=solar_data.get("num_panels", 0),
-            panel_efficiency=round(panel_efficiency, 2),
-            total_power_kw=solar_data.get("total_power_kw", 0),
-            annual_energy_kwh=solar_data.get("annual_energy_kwh", 0),
-            monthly_energy_kwh=round(solar_data.get("annual_energy_kwh", 0) / 12, 2),
-            daily_energy_kwh=round(solar_data.get("annual_energy_kwh", 0) / 365, 2),
-            solar_roi_analysis=roi_analysis,
-            bescom_analysis=bescom_analysis,
-            co2_offset_kg_per_year=env_impact["co2_offset_kg_per_year"],
-            trees_equivalent=env_impact["trees_equivalent"],
-            panel_specifications=panel_specs,
-            energy_offset_percentage=energy_offset_percentage,
-            image_base64=image_base64,
-            success=True,
-            message="Solar analysis completed successfully" + (" with BESCOM integration" if bescom_account_id else "")
-        )
+            except Exception as bescom_error:
+                print(f"BESCOM analysis failed: {bescom_error}")
+                # Continue without BESCOM analysis
         
+        return solar_data, roof_data, bescom_analysis, roi_analysis, energy_offset_percentage
+    
+    # Execute analysis; request validation errors above propagate as-is
+    try:
+        solar_data, roof_data, bescom_analysis, roi_analysis, energy_offset_percentage = await run_analysis()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing solar potential: {str(e)}")
+    
+    # Calculate efficiency
+    panel_efficiency = 0.0
+    if roof_data["roof_area"] > 0:
+        panel_efficiency = (solar_data["area_of_panels"] / roof_data["roof_area"]) * 100
+    
+    # Convert result image to base64
+    image_base64 = None
+    if solar_data.get("image_with_panels") is not None:
+        image_base64 = image_to_base64(solar_data["image_with_panels"])
+    
+    # Calculate environmental impact
+    annual_energy_kwh = solar_data.get("annual_energy_kwh", 0)
+    env_impact = calculate_environmental_impact(annual_energy_kwh)
+    
+    # Use the specifications of the panel model selected during analysis
+    panel_model = solar_data.get("panel_model", "medium")
+    panel_specs = PANEL_SPECS.get(panel_model)
+    if panel_specs is None:  # unknown model: medium specs, keep the reported name
+        panel_specs = {**PANEL_SPECS["medium"], "model": panel_model}
+    
+    # Validated once here; returning the Response directly skips FastAPI's
+    # response_model re-validation (the model still documents the schema)
+    response = SolarAnalysisResponse(
+        roof_area=roof_data["roof_area"],
+        panel_area=solar_data["area_of_panels"],
+        num_panels=solar_data.get("num_panels", 0),
+        panel_efficiency=round(panel_efficiency, 2),
+        total_power_kw=solar_data.get("total_power_kw", 0),
+        annual_energy_kwh=annual_energy_kwh,
+        monthly_energy_kwh=round(annual_energy_kwh / 12, 2),
+        daily_energy_kwh=round(annual_energy_kwh / 365, 2),
+        solar_roi_analysis=roi_analysis,
+        bescom_analysis=bescom_analysis,
+        co2_offset_kg_per_year=env_impact["co2_offset_kg_per_year"],
+        trees_equivalent=env_impact["trees_equivalent"],
+        panel_specifications=panel_specs,
+        energy_offset_percentage=energy_offset_percentage,
+        image_base64=image_base64,
+        success=True,
+        message="Solar analysis completed successfully" + (" with BESCOM integration" if bescom_account_id else "")
+    )
+    return ORJSONResponse(response.model_dump(mode="json"))
 
 @app.post("/api/rainwater/analyze")
 async def analyze_rainwater_harvesting(
@@ -453,10 +528,13 @@ async def analyze_rainwater_harvesting(
     """
     Analyze rainwater harvesting potential from uploaded rooftop image and location data
     """
+    from rooftop_detection import get_rainwater_data
+    from rainwater import rainwater_report
+    
+    # Validate and process image
+    image = await validate_image(file)
+    
     try:
-        # Validate and process image
-        image = validate_image(file)
-        
         # Get roof area from image
         rainwater_data = get_rainwater_data(image)
         roof_area = rainwater_data["roof_area"]
@@ -473,43 +551,31 @@ async def analyze_rainwater_harvesting(
             tank_capacity_liters=tank_capacity_liters,
             connection_type=connection_type
         )
-        
-        # Convert pandas DataFrames to JSON-serializable format
-        monthly_data = report["monthly_df"].to_dict('records')
-        
-        return {
-            "success": True,
-            "message": "Rainwater harvesting analysis completed successfully",
-            "roof_area": roof_area,
-            "summary": report["summary"],
-            "monthly_data": monthly_data,
-            "daily_data_count": len(report["daily_df"])
-        }
-        
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing rainwater harvesting: {str(e)}")
+    
+    # Convert pandas DataFrames to JSON-serializable format; the payload is then
+    # already plain data, so it goes straight to orjson without jsonable_encoder
+    monthly_data = dataframe_records(report["monthly_df"])
+    
+    return ORJSONResponse({
+        "success": True,
+        "message": "Rainwater harvesting analysis completed successfully",
+        "roof_area": roof_area,
+        "summary": report["summary"],
+        "monthly_data": monthly_data,
+        "daily_data_count": len(report["daily_df"])
+    })
 
 @app.get("/api/roof-types")
 async def get_roof_types():
     """
     Get available roof types for rainwater harvesting analysis
     """
-    roof_types = [
-        {"value": "concrete", "label": "Concrete", "coefficient": 0.80},
-        {"value": "tile", "label": "Tile", "coefficient": 0.70},
-        {"value": "metal", "label": "Metal", "coefficient": 0.90},
-        {"value": "cgi", "label": "CGI (Corrugated Galvanized Iron)", "coefficient": 0.90},
-        {"value": "asbestos", "label": "Asbestos", "coefficient": 0.80},
-        {"value": "custom", "label": "Custom", "coefficient": None}
-    ]
-    
-    return {
-        "success": True,
-        "message": "Available roof types retrieved successfully",
-        "roof_types": roof_types
-    }
+    return ROOF_TYPES_RESPONSE
 
 # Exception handlers
+# (the 500 handler also receives any unhandled exception, via ServerErrorMiddleware)
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
     return JSONResponse(
@@ -579,6 +645,11 @@ class CustomMangum(Mangum):
 
 handler = CustomMangum(app, lifespan="off")
 
+# With lifespan off the startup hooks never run on Lambda, so warm up during
+# the init phase instead (once per container, before the first invocation)
+if os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+    warm_up_analysis()
+
 def lambda_handler(event, context):
     logger.info("Lambda Handler Invoked.")
     try:
@@ -650,6 +721,8 @@ def lambda_handler(event, context):
         }
 
 if __name__ == "__main__":
+    import uvicorn
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
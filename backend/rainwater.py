@@ -20,16 +20,19 @@ Usage (example):
 """
 
 from __future__ import annotations
+import threading
 from dataclasses import dataclass
+from enum import IntEnum
 from datetime import datetime, timedelta, timezone
 from dateutil.relativedelta import relativedelta
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
 import openmeteo_requests
 import requests_cache
+from cachetools import TTLCache
 from retry_requests import retry
 
 # --------- Constants & reference tables ---------
@@ -44,6 +47,20 @@ RUNOFF_COEFFICIENTS: Dict[str, float] = {
     "asbestos": 0.80,
     # You may pass roof_type="custom" and set custom_coefficient in report()
 }
+_ROOF_TYPE_CHOICES = list(RUNOFF_COEFFICIENTS)
+
+class RoofType(IntEnum):
+    """Roof types accepted alongside their string names; values index _ROOF_COEFF_ARR."""
+    CONCRETE = 0
+    TILE = 1
+    METAL = 2
+    CGI = 3
+    ASBESTOS = 4
+    CUSTOM = 5
+
+_ROOF_TYPES_BY_NAME: Dict[str, RoofType] = {t.name.lower(): t for t in RoofType}
+# Coefficient per RoofType (CUSTOM's comes from custom_coefficient)
+_ROOF_COEFF_ARR = np.array([RUNOFF_COEFFICIENTS.get(t.name.lower(), 0.0) for t in RoofType], dtype=np.float64)
 
 # BWSSB (Bengaluru) monthly tariff slabs (₹ per 1000 L) + sanitary + meter fee (15 mm)
 # Source: Citizen Matters explainer summarizing BWSSB schedule (Mar 31, 2025).
@@ -77,17 +94,55 @@ def _default_dates() -> Tuple[str, str]:
     start_date = end_date - relativedelta(years=1)
     return start_date.isoformat(), end_date.isoformat()
 
+# Parsed frames per (lat, lon, dates, timezone), on top of the on-disk HTTP cache
+WEATHER_CACHE: TTLCache = TTLCache(maxsize=128, ttl=24 * 3600)
+_WEATHER_CACHE_LOCK = threading.Lock()
+
 def fetch_openmeteo_daily(lat: float, lon: float,
                           start_date: Optional[str] = None,
                           end_date: Optional[str] = None,
-                          timezone_name: str = "auto") -> pd.DataFrame:
+                          timezone_name: str = "auto",
+                          include_et0: bool = False) -> pd.DataFrame:
     """
-    Fetch daily rain_sum and ET0 (FAO-56) from Open-Meteo Historical API.
-    Returns a DataFrame with columns: date (tz-aware UTC), rain_mm, et0_mm
+    Fetch daily rain_sum (and optionally ET0, FAO-56) from Open-Meteo Historical API.
+    Returns a DataFrame with columns: date (tz-aware UTC), rain_mm[, et0_mm]
+    (float32, as delivered by the API; widened where computation starts)
+    ET0 is informational only (never used for capture or billing), so it is
+    requested only when include_et0 is set.
+    Results are cached in-process for 24 h; callers get a shallow copy.
+    """
+    return fetch_openmeteo_daily_many([(lat, lon)], start_date, end_date, timezone_name, include_et0)[0]
+
+def fetch_openmeteo_daily_many(coords: Sequence[Tuple[float, float]],
+                               start_date: Optional[str] = None,
+                               end_date: Optional[str] = None,
+                               timezone_name: str = "auto",
+                               include_et0: bool = False) -> List[pd.DataFrame]:
+    """
+    fetch_openmeteo_daily for several (lat, lon) sites, one frame per site in input order.
+    Sites not in the in-process cache are fetched together in ONE multi-location
+    request, so N uncached sites cost a single round-trip instead of N.
     """
     if start_date is None or end_date is None:
         start_date, end_date = _default_dates()
 
+    keys = [(round(lat, 4), round(lon, 4), start_date, end_date, timezone_name, include_et0) for lat, lon in coords]
+    with _WEATHER_CACHE_LOCK:
+        frames = [WEATHER_CACHE.get(key) for key in keys]
+    missing: Dict[tuple, Tuple[float, float]] = {}
+    for key, coord, df in zip(keys, coords, frames):
+        if df is None:
+            missing.setdefault(key, coord)
+    if missing:
+        fetched = dict(zip(missing, _request_openmeteo_daily(list(missing.values()), start_date, end_date,
+                                                             timezone_name, include_et0)))
+        with _WEATHER_CACHE_LOCK:
+            WEATHER_CACHE.update(fetched)
+        frames = [fetched[key] if df is None else df for key, df in zip(keys, frames)]
+    return [df.copy(deep=False) for df in frames]
+
+def _request_openmeteo_daily(coords: Sequence[Tuple[float, float]], start_date: str, end_date: str,
+                             timezone_name: str, include_et0: bool) -> List[pd.DataFrame]:
     cache = requests_cache.CachedSession(".cache", expire_after=-1)
     session = retry(cache, retries=5, backoff_factor=0.2)
     om = openmeteo_requests.Client(session=session)
@@ -95,32 +150,29 @@ def fetch_openmeteo_daily(lat: float, lon: float,
     url = "https://archive-api.open-meteo.com/v1/archive"
     # IMPORTANT: order of 'daily' variables controls indexing in response
     params = {
-        "latitude": lat,
-        "longitude": lon,
+        "latitude": [lat for lat, _lon in coords],
+        "longitude": [lon for _lat, lon in coords],
         "start_date": start_date,
         "end_date": end_date,
-        "daily": ["rain_sum", "et0_fao_evapotranspiration"],
+        "daily": ["rain_sum", "et0_fao_evapotranspiration"] if include_et0 else ["rain_sum"],
         "timezone": timezone_name,
         "cell_selection": "land",
     }
+    # One response per location, in request order
     responses = om.weather_api(url, params=params)
-    resp = responses[0]
-
-    daily = resp.Daily()
-    # Build datetime index from epoch seconds provided
-    date_index = pd.date_range(
-        start=pd.to_datetime(daily.Time(), unit="s", utc=True),
-        end=pd.to_datetime(daily.TimeEnd(), unit="s", utc=True),
-        freq=pd.Timedelta(seconds=daily.Interval()),
-        inclusive="left",
-    )
+    return [_daily_frame(resp.Daily(), include_et0) for resp in responses]
+
+def _daily_frame(daily, include_et0: bool) -> pd.DataFrame:
+    # Build datetime index from epoch seconds provided ([Time, TimeEnd) every Interval s)
+    epoch_s = np.arange(daily.Time(), daily.TimeEnd(), daily.Interval(), dtype=np.int64)
+    date_index = pd.DatetimeIndex(epoch_s.astype("datetime64[s]").astype("datetime64[ns]"), tz="UTC")
     # Index 0 -> rain_sum, Index 1 -> et0_fao_evapotranspiration (must match 'daily' order)
     rain = daily.Variables(0).ValuesAsNumpy()
-    et0 = daily.Variables(1).ValuesAsNumpy()
+    columns = {"date": date_index, "rain_mm": rain.astype(np.float32, copy=False)}
+    if include_et0:
+        columns["et0_mm"] = daily.Variables(1).ValuesAsNumpy().astype(np.float32, copy=False)
 
-    df = pd.DataFrame(
-        {"date": date_index, "rain_mm": rain.astype(float), "et0_mm": et0.astype(float)}
-    )
+    df = pd.DataFrame(columns)
     return df
 
 # --------- Harvest model ---------
@@ -128,33 +180,54 @@ def fetch_openmeteo_daily(lat: float, lon: float,
 @dataclass
 class HarvestConfig:
     roof_area_m2: float
-    roof_type: str = "concrete"
+    roof_type: Union[str, RoofType] = "concrete"
     collection_efficiency: float = 0.90   # filter/piping losses (0-1)
     first_flush_mm: float = 1.5           # mm per rainy day to discard
     custom_coefficient: Optional[float] = None
 
-def _roof_coefficient(roof_type: str, custom: Optional[float]) -> float:
-    if roof_type == "custom":
+    def __post_init__(self):
+        # Validate once; the resolved type and coefficient are reused by capture and summary
+        self._roof = _roof_type(self.roof_type)
+        self._coeff = _roof_coefficient(self._roof, self.custom_coefficient)
+
+def _roof_type(roof_type: Union[str, RoofType]) -> RoofType:
+    roof = roof_type if isinstance(roof_type, RoofType) else _ROOF_TYPES_BY_NAME.get(roof_type)
+    if roof is None:
+        raise ValueError(f"Unknown roof_type '{roof_type}'. Choose from {_ROOF_TYPE_CHOICES} or 'custom'.")
+    return roof
+
+def _roof_coefficient(roof_type: Union[str, RoofType], custom: Optional[float]) -> float:
+    roof = _roof_type(roof_type)
+    if roof is RoofType.CUSTOM:
         if not custom:
             raise ValueError("custom_coefficient must be provided when roof_type='custom'.")
         return float(custom)
-    if roof_type not in RUNOFF_COEFFICIENTS:
-        raise ValueError(f"Unknown roof_type '{roof_type}'. Choose from {list(RUNOFF_COEFFICIENTS)} or 'custom'.")
-    return RUNOFF_COEFFICIENTS[roof_type]
+    return float(_ROOF_COEFF_ARR[roof])
 
 def compute_daily_capture(df_daily: pd.DataFrame, cfg: HarvestConfig) -> pd.DataFrame:
     """
     Compute daily captured liters from rain (after first-flush & losses).
     1 mm rain over 1 m² = 1 liter (rule-of-thumb).
     """
-    c_r = _roof_coefficient(cfg.roof_type, cfg.custom_coefficient)
-    d = df_daily.copy()
-    # Apply first-flush once per rainy day
-    rain_after_ff = np.where(d["rain_mm"] > 0, np.maximum(0.0, d["rain_mm"] - cfg.first_flush_mm), 0.0)
-    # Captured mm after roof runoff coefficient and collection efficiency
-    captured_mm = rain_after_ff * c_r * cfg.collection_efficiency
-    # Convert to liters by multiplying roof area (1 mm × 1 m² = 1 L)
-    d["captured_liters"] = captured_mm * cfg.roof_area_m2
+    c_r = cfg._coeff
+    # Shallow copy: columns are only ever replaced or added, never written in place,
+    # so the caller's frame is left untouched without duplicating its data
+    d = df_daily.copy(deep=False)
+    # Weather may be stored as float32; sums and bills need float64 (2-decimal liters/rupees)
+    rain = d["rain_mm"].to_numpy(dtype=np.float64)
+    d["rain_mm"] = rain
+    if "et0_mm" in d:
+        d["et0_mm"] = d["et0_mm"].to_numpy(dtype=np.float64)
+    # Apply first-flush once per rainy day (fmax also zeroes missing/NaN days)
+    rain_after_ff = np.fmax(rain - cfg.first_flush_mm, 0.0)
+    if cfg.first_flush_mm < 0:
+        rain_after_ff[~(rain > 0)] = 0.0
+    # Captured mm after roof runoff coefficient and collection efficiency,
+    # then liters by multiplying roof area (1 mm × 1 m² = 1 L); one buffer, in place
+    captured = np.multiply(rain_after_ff, c_r)
+    np.multiply(captured, cfg.collection_efficiency, out=captured)
+    np.multiply(captured, cfg.roof_area_m2, out=captured)
+    d["captured_liters"] = captured
     d["rain_after_ff_mm"] = rain_after_ff
     d["runoff_coeff_used"] = c_r
     d["collection_eff_used"] = cfg.collection_efficiency
@@ -170,6 +243,57 @@ class TankConfig:
     def daily_demand(self) -> float:
         return self.monthly_demand_liters / 30.437  # avg days per month
 
+def _next_inflow_days(inflow: np.ndarray) -> np.ndarray:
+    """Index of the first day >= i with non-zero inflow (n when there is none)."""
+    n = inflow.shape[0]
+    days = np.where(inflow != 0.0, np.arange(n), n)
+    return np.minimum.accumulate(days[::-1])[::-1]
+
+def _tank_kernel(inflow: np.ndarray, next_wet: np.ndarray, capacity: float, demand: float):
+    """Daily mass balance; returns (storage, overflow, delivered, unmet) arrays."""
+    n = inflow.shape[0]
+    # Outputs start as an empty tank on a dry day (nothing stored, delivered or
+    # spilled; full demand unmet). The tank stays that way until the next inflow,
+    # so such stretches are skipped via next_wet and only other days are stepped.
+    storages = np.zeros(n, dtype=np.float64)
+    overflows = np.zeros(n, dtype=np.float64)
+    delivered = np.zeros(n, dtype=np.float64)
+    deficits = np.full(n, demand if demand > 0.0 else 0.0, dtype=np.float64)
+    storage = 0.0
+    i = 0
+    while i < n:
+        if storage == 0.0 and demand > 0.0 and next_wet[i] != i:
+            i = next_wet[i]
+            continue
+        storage += inflow[i]
+        overflow = storage - capacity
+        if overflow > 0.0:
+            storage = capacity
+        else:
+            overflow = 0.0
+        # withdraw demand
+        deliver = demand if demand < storage else storage
+        storage -= deliver
+        deficit = demand - deliver
+        if not deficit > 0.0:
+            deficit = 0.0
+
+        storages[i] = storage
+        overflows[i] = overflow
+        delivered[i] = deliver
+        deficits[i] = deficit
+        i += 1
+    return storages, overflows, delivered, deficits
+
+# Compile the kernel with Numba when available (first compile is cached on disk);
+# otherwise, or if compiling/caching fails here, run the same loop in Python.
+try:
+    from numba import njit
+    _simulate_tank_kernel = njit(cache=True)(_tank_kernel)
+    _simulate_tank_kernel(np.zeros(1), np.zeros(1, dtype=np.int64), 1.0, 1.0)
+except Exception:
+    _simulate_tank_kernel = _tank_kernel
+
 def simulate_tank(daily_df: pd.DataFrame, tank_cfg: TankConfig) -> pd.DataFrame:
     """
     Simple daily mass-balance tank simulation.
@@ -177,30 +301,15 @@ def simulate_tank(daily_df: pd.DataFrame, tank_cfg: TankConfig) -> pd.DataFrame:
     - Outflow: fixed daily demand (derived from monthly demand)
     - Storage bounded [0, capacity]; overflow counted when storage would exceed capacity.
     """
-    d = daily_df.copy().reset_index(drop=True)
+    d = daily_df.copy(deep=False)
+    d.index = pd.RangeIndex(len(d))
     capacity = float(tank_cfg.tank_capacity_liters)
     demand = float(tank_cfg.daily_demand())
 
-    storage = 0.0
-    storages = []
-    overflows = []
-    deficits = []
-    delivered = []
-
-    for inflow in d["captured_liters"].to_numpy():
-        storage += inflow
-        overflow = max(0.0, storage - capacity)
-        if overflow > 0:
-            storage = capacity
-        # withdraw demand
-        deliver = min(storage, demand)
-        storage -= deliver
-        deficit = max(0.0, demand - deliver)
-
-        storages.append(storage)
-        overflows.append(overflow)
-        deficits.append(deficit)
-        delivered.append(deliver)
+    inflow = d["captured_liters"].to_numpy(dtype=np.float64)
+    storages, overflows, delivered, deficits = _simulate_tank_kernel(
+        inflow, _next_inflow_days(inflow), capacity, demand
+    )
 
     d["tank_storage_liters"] = storages
     d["overflow_liters"] = overflows
@@ -211,57 +320,81 @@ def simulate_tank(daily_df: pd.DataFrame, tank_cfg: TankConfig) -> pd.DataFrame:
 
 # --------- Billing helpers (BWSSB default) ---------
 
-def _slab_charge(liters: float, slabs) -> Tuple[float, float]:
+def _slab_table(slabs) -> Dict[str, np.ndarray]:
     """
-    Return (water_charge_rs, sanitary_rs) given liters and slab table.
+    Precompute per-slab arrays for vectorized billing.
     Slab tuple: (upper_liters_inclusive, water_tariff_rs_per_kl, sanitary_charge, meter_fee_rs)
     sanitary_charge: numeric OR "25%" meaning 25% of water tariff (per 1000 L).
+    Flat sanitary charges are pro-rated by consumption span to keep them usage-linked.
     """
-    water_rs = 0.0
-    sanitary_rs = 0.0
-    remaining = float(liters)
-    lower = 0.0
-
-    for upper, tariff, sanitary, _meter in slabs:
-        span = min(remaining, upper - lower)
-        if span <= 0:
-            continue
-        kl = span / 1000.0
-        water_rs += tariff * kl
-        # sanitary charge logic
-        if isinstance(sanitary, str) and sanitary.endswith("%"):
-            sanitary_pct = float(sanitary.strip("%")) / 100.0
-            sanitary_rs += (tariff * sanitary_pct) * kl
-        else:
-            # Flat sanitary charge is typically per month per slab (interpretation varies).
-            # We’ll pro-rate by consumption span to keep it usage-linked.
-            sanitary_rs += float(sanitary) * (kl / max(1.0, (upper - lower) / 1000.0))
-        remaining -= span
-        lower = upper
-        if remaining <= 0:
-            break
-    return water_rs, sanitary_rs
-
-def bwssb_bill(liters: float, connection_type: str = "domestic") -> Dict[str, float]:
-    slabs = BWSSB_TARIFFS["domestic" if connection_type == "domestic" else "non_domestic"]
-    water_rs, sanitary_rs = _slab_charge(liters, slabs)
-    # Meter fee: pick the meter fee of the LAST slab used (simplest, conservative)
-    last_meter_fee = next(m for u, t, s, m in slabs if u >= min(liters, 1e12))
-    total = water_rs + sanitary_rs + last_meter_fee
+    upper = np.array([u for u, _t, _s, _m in slabs], dtype=np.float64)
+    lower = np.concatenate(([0.0], upper[:-1]))
+    tariff = np.array([t for _u, t, _s, _m in slabs], dtype=np.float64)
+    meter = np.array([m for _u, _t, _s, m in slabs], dtype=np.float64)
+    sanitary_rate = np.array([t * (float(s.strip("%")) / 100.0) if isinstance(s, str) and s.endswith("%") else 0.0
+                              for _u, t, s, _m in slabs], dtype=np.float64)
+    sanitary_flat = np.array([0.0 if isinstance(s, str) else float(s) for _u, _t, s, _m in slabs], dtype=np.float64)
+    table = {
+        "upper": upper,
+        "lower": lower,
+        "tariff": tariff,
+        "meter": meter,
+        "sanitary_rate": sanitary_rate,
+        "sanitary_flat": sanitary_flat,
+        "flat_span_kl": np.maximum(1.0, (upper - lower) / 1000.0),
+    }
+    # Charges for every slab filled completely, accumulated in slab order (the last slab is open-ended)
+    full_idx = np.arange(len(slabs) - 1)
+    full_water, full_sanitary = _slab_charges(table, (upper[:-1] - lower[:-1]) / 1000.0, full_idx)
+    table["water_before"] = np.concatenate(([0.0], np.cumsum(full_water)))
+    table["sanitary_before"] = np.concatenate(([0.0], np.cumsum(full_sanitary)))
+    return table
+
+def _slab_charges(table: Dict[str, np.ndarray], kl: np.ndarray, idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (water_rs, sanitary_rs) for kl kilolitres billed within slabs idx."""
+    water = table["tariff"][idx] * kl
+    sanitary = table["sanitary_rate"][idx] * kl + table["sanitary_flat"][idx] * (kl / table["flat_span_kl"][idx])
+    return water, sanitary
+
+BWSSB_TABLES = {connection: _slab_table(slabs) for connection, slabs in BWSSB_TARIFFS.items()}
+
+def bwssb_bill_vec(liters, connection_type: str = "domestic") -> Dict[str, np.ndarray]:
+    """
+    Vectorized BWSSB bill over an array of monthly liters (unrounded rupee arrays).
+    The meter fee is that of the LAST slab used (simplest, conservative).
+    """
+    table = BWSSB_TABLES["domestic" if connection_type == "domestic" else "non_domestic"]
+    liters = np.asarray(liters, dtype=np.float64)
+    # Slab containing each volume (upper bounds are inclusive)
+    idx = np.searchsorted(table["upper"], np.minimum(liters, 1e12), side="left")
+    used = np.maximum(liters, 0.0)
+    water, sanitary = _slab_charges(table, (used - table["lower"][idx]) / 1000.0, idx)
+    water = table["water_before"][idx] + water
+    sanitary = table["sanitary_before"][idx] + sanitary
+    meter = table["meter"][idx]
     return {
-        "water_rs": round(water_rs, 2),
-        "sanitary_rs": round(sanitary_rs, 2),
-        "meter_fee_rs": round(last_meter_fee, 2),
-        "total_rs": round(total, 2),
+        "water_rs": water,
+        "sanitary_rs": sanitary,
+        "meter_fee_rs": meter,
+        "total_rs": water + sanitary + meter,
     }
 
+def bwssb_bill(liters: float, connection_type: str = "domestic") -> Dict[str, float]:
+    bill = bwssb_bill_vec([liters], connection_type)
+    return {key: round(float(values[0]), 2) for key, values in bill.items()}
+
 # --------- Public API ---------
 
+# Daily output columns, in order (et0_mm sits after rain_mm when requested)
+_DAILY_BASE_COLS = ("date", "rain_mm")
+_DAILY_CAPTURE_COLS = ("rain_after_ff_mm", "captured_liters", "offset_liters")
+_DAILY_TANK_COLS = ("tank_storage_liters", "overflow_liters", "unmet_demand_liters", "daily_demand_liters")
+
 def rainwater_report(
     lat: float,
     lon: float,
     roof_area_m2: float,
-    roof_type: str = "concrete",
+    roof_type: Union[str, RoofType] = "concrete",
     collection_efficiency: float = 0.90,
     first_flush_mm: float = 1.5,
     monthly_demand_liters: float = 32000.0,
@@ -270,6 +403,7 @@ def rainwater_report(
     custom_coefficient: Optional[float] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    include_et0: bool = False,
 ) -> Dict[str, object]:
     """
     One-call end-to-end:
@@ -278,8 +412,9 @@ def rainwater_report(
     - Optional tank simulation
     - Monthly aggregation + BWSSB bill with and without RWH offset
     Returns dict with 'daily_df', 'monthly_df', 'summary'
+    (et0_mm columns are included only when include_et0 is set)
     """
-    weather = fetch_openmeteo_daily(lat, lon, start_date, end_date)
+    weather = fetch_openmeteo_daily(lat, lon, start_date, end_date, include_et0=include_et0)
     cfg = HarvestConfig(
         roof_area_m2=roof_area_m2,
         roof_type=roof_type,
@@ -298,32 +433,33 @@ def rainwater_report(
     else:
         daily["offset_liters"] = daily["captured_liters"]
 
-    # Monthly aggregation
-    daily["month"] = daily["date"].dt.tz_convert("UTC").dt.to_period("M").dt.to_timestamp()
-    monthly = daily.groupby("month").agg(
-        rain_mm=("rain_mm", "sum"),
-        rain_days=("rain_mm", lambda s: int((s > 0).sum())),
-        et0_mm=("et0_mm", "sum"),
-        captured_liters=("captured_liters", "sum"),
-        offset_liters=("offset_liters", "sum"),
-        overflow_liters=("overflow_liters", "sum") if "overflow_liters" in daily else ("captured_liters", lambda _: 0.0),
-        unmet_demand_liters=("unmet_demand_liters", "sum") if "unmet_demand_liters" in daily else ("captured_liters", lambda _: 0.0),
-    ).reset_index()
+    # Monthly aggregation (UTC calendar months); plain "sum" reducers only,
+    # with rain days precomputed as a 0/1 column instead of a lambda
+    # int8 indicator (monthly counts fit easily); rain_days is widened back to int64 below
+    daily["rain_day"] = (daily["rain_mm"] > 0).astype(np.int8)
+    sum_cols = ["rain_mm", "rain_day"] + (["et0_mm"] if include_et0 else []) + ["captured_liters", "offset_liters"]
+    has_tank = "overflow_liters" in daily
+    if has_tank:
+        sum_cols += ["overflow_liters", "unmet_demand_liters"]
+    # .values of a tz-aware column is naive UTC datetime64[ns]; one cast truncates to month starts
+    month_starts = daily["date"].values.astype("datetime64[M]").astype("datetime64[ns]")
+    month_index = pd.DatetimeIndex(month_starts, name="month")
+    monthly = (daily[sum_cols].set_axis(month_index).resample("MS").sum()
+               .rename(columns={"rain_day": "rain_days"}).reset_index())
+    monthly["rain_days"] = monthly["rain_days"].astype(np.int64)
+    if not has_tank:
+        monthly["overflow_liters"] = 0.0
+        monthly["unmet_demand_liters"] = 0.0
 
     # Billing & savings (baseline vs net after offset; clamp at 0)
-    baseline_bill = []
-    net_bill = []
-    savings_rs = []
-    for _, row in monthly.iterrows():
-        baseline = bwssb_bill(monthly_demand_liters, connection_type)
-        net_usage = max(0.0, monthly_demand_liters - row["offset_liters"])
-        net = bwssb_bill(net_usage, connection_type)
-        baseline_bill.append(baseline["total_rs"])
-        net_bill.append(net["total_rs"])
-        savings_rs.append(round(baseline["total_rs"] - net["total_rs"], 2))
-    monthly["baseline_bill_rs"] = baseline_bill
+    # Totals keep Python's round() so half-paisa cases round exactly as in bwssb_bill
+    baseline_total = bwssb_bill(monthly_demand_liters, connection_type)["total_rs"]
+    net_usage = np.maximum(0.0, monthly_demand_liters - monthly["offset_liters"].to_numpy(dtype=np.float64))
+    net_bill = [round(total, 2) for total in bwssb_bill_vec(net_usage, connection_type)["total_rs"].tolist()]
+    monthly["baseline_bill_rs"] = baseline_total
     monthly["net_bill_rs"] = net_bill
-    monthly["savings_rs"] = savings_rs
+    # Both operands are already whole paise, so np.round agrees with round() here
+    monthly["savings_rs"] = (monthly["baseline_bill_rs"] - monthly["net_bill_rs"]).round(2)
 
     # Totals & performance
     total_captured = float(monthly["captured_liters"].sum())
@@ -339,12 +475,13 @@ def rainwater_report(
 
     summary = {
         "coords": {"lat": lat, "lon": lon},
-        "period": {"start": weather["date"].min().date().isoformat(),
-                   "end": weather["date"].max().date().isoformat()},
+        # Open-Meteo returns days in ascending order, so the ends are the first/last rows
+        "period": {"start": weather["date"].iat[0].date().isoformat(),
+                   "end": weather["date"].iat[-1].date().isoformat()},
         "roof": {
             "area_m2": roof_area_m2,
-            "roof_type": roof_type,
-            "runoff_coeff": _roof_coefficient(roof_type, custom_coefficient),
+            "roof_type": cfg._roof.name.lower(),
+            "runoff_coeff": cfg._coeff,
             "collection_efficiency": collection_efficiency,
             "first_flush_mm": first_flush_mm,
         },
@@ -368,13 +505,8 @@ def rainwater_report(
     }
 
     # Tidy daily columns ordering
-    daily_cols = [c for c in [
-        "date","rain_mm","et0_mm","rain_after_ff_mm","captured_liters","offset_liters",
-        "tank_storage_liters" if "tank_storage_liters" in daily else None,
-        "overflow_liters" if "overflow_liters" in daily else None,
-        "unmet_demand_liters" if "unmet_demand_liters" in daily else None,
-        "daily_demand_liters" if "daily_demand_liters" in daily else None,
-    ] if c]
-    return {"daily_df": daily[daily_cols].copy(),
-            "monthly_df": monthly.copy(),
+    daily_cols = (_DAILY_BASE_COLS + (("et0_mm",) if include_et0 else ()) + _DAILY_CAPTURE_COLS
+                  + (_DAILY_TANK_COLS if tank_capacity_liters else ()))
+    return {"daily_df": daily.loc[:, list(daily_cols)],
+            "monthly_df": monthly,
             "summary": summary}
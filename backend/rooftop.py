@@ -2,14 +2,16 @@
 from __future__ import annotations
 import math
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import cv2
 import numpy as np
 from PIL import Image
-from shapely.geometry import Polygon, box
+import shapely
+from shapely.geometry import Polygon
 from shapely import affinity
 from shapely.ops import unary_union
 
@@ -23,6 +25,23 @@ PANEL_SPECS: Dict[str, Dict] = {
     "large":  {"L_m": 2.384, "W_m": 1.303, "watt_nom": 620},  # 210mm/132HC
 }
 
+# Angle trials overlap on threads (Shapely 2.0 / GEOS and OpenCV release the GIL);
+# ROOFTOP_ANGLE_WORKERS=1 evaluates them sequentially
+ANGLE_WORKERS = int(os.getenv("ROOFTOP_ANGLE_WORKERS", str(min(4, os.cpu_count() or 1))))
+_ANGLE_POOL: Optional[ThreadPoolExecutor] = (
+    ThreadPoolExecutor(max_workers=ANGLE_WORKERS, thread_name_prefix="rooftop-angle") if ANGLE_WORKERS > 1 else None
+)
+
+# OpenCV's transparent API: obstacle filters run on OpenCL (e.g. an iGPU) when present;
+# ROOFTOP_OPENCL=0 keeps them on the CPU
+USE_OPENCL = cv2.ocl.haveOpenCL() and os.getenv("ROOFTOP_OPENCL", "1") != "0"
+
+# 3x3 Sobel of an 8-bit image stays within |g| <= 4 * 255, so |grad| < 1444
+GRAD_BINS = 1444
+
+# Below this radius a direct elliptical dilate beats the rectangle staircase
+ELLIPSE_STAIRCASE_MIN_R = 5
+
 # -----------------------------
 # Config & results
 # -----------------------------
@@ -39,6 +58,7 @@ class LayoutParams:
 
     fill_relative_to: str = "usable"   # "usable" | "roof"
     overshoot_tolerance_frac: float = 0.20  # allow up to 20% of one-panel area over target
+    target_tolerance_frac: float = 0.02  # stop trying angles once within 2% of target
 
 @dataclass
 class LayoutResult:
@@ -50,8 +70,16 @@ class LayoutResult:
 # -----------------------------
 # Image/geometry utilities
 # -----------------------------
-def _to_bgr(img: Image.Image) -> np.ndarray:
-    return cv2.cvtColor(np.array(img.convert("RGB")), cv2.COLOR_RGB2BGR)
+def _to_bgr(img: Union[Image.Image, np.ndarray]) -> np.ndarray:
+    if isinstance(img, np.ndarray):  # already decoded by OpenCV (BGR, gray or BGRA)
+        if img.ndim == 2:
+            return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        if img.shape[2] == 4:
+            return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+        return img
+    # convert() copies even when the image is already RGB; cvtColor makes the one owned copy
+    rgb = np.asarray(img if img.mode == "RGB" else img.convert("RGB"))
+    return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
 
 def _largest_contour_mask(gray: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     """Otsu -> closing -> largest external contour -> filled mask."""
@@ -90,14 +118,94 @@ def _estimate_LW_from_area(area_m2: float, contour: np.ndarray) -> Tuple[float,
     W = area_m2 / L
     return float(L), float(W)
 
-def _m_per_px_from_area(roof_area_m2: float, mask: np.ndarray) -> float:
-    area_px = float(cv2.countNonZero(mask))
+def _m_per_px_from_area(roof_area_m2: float, area_px: float) -> float:
     if area_px == 0:
         raise ValueError("Roof mask area is zero")
     return math.sqrt(roof_area_m2 / area_px)
 
-def _poly_to_int_xy(poly: Polygon) -> np.ndarray:
-    return np.array(list(poly.exterior.coords), dtype=np.int32)
+def _rotate_many(geoms: List[Polygon], angle_deg: float, origin: Tuple[float, float]) -> List[Polygon]:
+    """affinity.rotate for a whole list at once: same matrix, one vectorized transform."""
+    if not geoms:
+        return []
+    angle = angle_deg * math.pi / 180.0
+    cosp = math.cos(angle)
+    sinp = math.sin(angle)
+    if abs(cosp) < 2.5e-16:
+        cosp = 0.0
+    if abs(sinp) < 2.5e-16:
+        sinp = 0.0
+    x0, y0 = origin
+    xoff = x0 - x0 * cosp + y0 * sinp
+    yoff = y0 - x0 * sinp - y0 * cosp
+
+    def rotate_coords(coords: np.ndarray) -> np.ndarray:
+        x, y = coords.T
+        return np.stack([cosp * x + -sinp * y + xoff, sinp * x + cosp * y + yoff]).T
+
+    return list(shapely.transform(np.asarray(geoms, dtype=object), rotate_coords))
+
+def _host(arr: Union[np.ndarray, "cv2.UMat"]) -> np.ndarray:
+    return arr.get() if isinstance(arr, cv2.UMat) else arr
+
+def _masked_quantile(img: np.ndarray, mask: np.ndarray, q: float, bins: int) -> float:
+    """
+    np.quantile(img[mask > 0], q) from a masked unit-bin histogram over [0, bins):
+    the ranks are located in the cumulative counts and only their bin is partitioned
+    (uint8 bins hold a single value, so nothing is gathered).
+    """
+    cdf = np.cumsum(cv2.calcHist([img], [0], mask, [bins], [0, bins]).ravel().astype(np.int64))
+    n = int(cdf[-1])
+    # numpy's "linear" method: neighbouring order statistics blended by the fraction
+    virtual = (n - 1) * q
+    lo = math.floor(virtual)
+    ranks = [lo, min(lo + 1, n - 1)]
+    j_lo, j_hi = (int(j) for j in np.searchsorted(cdf, ranks, side="right"))
+    if img.dtype == np.uint8:
+        prev, nxt = np.asarray(j_lo, np.uint8), np.asarray(j_hi, np.uint8)
+    else:
+        upper = float(np.nextafter(np.float32(j_hi + 1), np.float32(0)))
+        in_bins = cv2.bitwise_and(cv2.inRange(img, float(j_lo), upper), mask)
+        below = int(cdf[j_lo - 1]) if j_lo else 0
+        ks = [r - below for r in ranks]
+        part = np.partition(img[in_bins > 0], ks)
+        prev, nxt = np.asarray(part[ks[0]]), np.asarray(part[ks[1]])
+    # same lerp as np.quantile (difference taken in the image dtype)
+    gamma = np.asarray(virtual - lo)
+    diff = np.subtract(nxt, prev)
+    if gamma >= 0.5:
+        return float(np.subtract(nxt, diff * (1 - gamma)))
+    return float(np.add(prev, diff * gamma))
+
+def _dilate_ellipse(img: Union[np.ndarray, "cv2.UMat"], r: int) -> Union[np.ndarray, "cv2.UMat"]:
+    """
+    cv2.dilate with the (2r+1)-square MORPH_ELLIPSE element, bit for bit. The element
+    is a staircase of centred rectangles, and rectangle dilations are separable
+    (cost independent of size), so large radii take one cheap pass per step instead
+    of a per-element-pixel pass.
+    """
+    ellipse = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2 * r + 1, 2 * r + 1))
+    if r < ELLIPSE_STAIRCASE_MIN_R:
+        return cv2.dilate(img, ellipse, iterations=1)
+    half_w = ellipse[r:].sum(axis=1) // 2   # half-width of rows dy = 0..r
+    out = None
+    dy = 0
+    while dy <= r:
+        w = int(half_w[dy])
+        h = dy
+        while h < r and half_w[h + 1] == w:
+            h += 1
+        step = cv2.dilate(img, cv2.getStructuringElement(cv2.MORPH_RECT, (2 * w + 1, 2 * h + 1)))
+        out = step if out is None else cv2.max(out, step, dst=out)
+        dy = h + 1
+    return out
+
+def _polys_to_int_xy(polys: List[Polygon]) -> List[np.ndarray]:
+    """Exterior rings as int32 (x, y) arrays, extracted in one batch."""
+    if not polys:
+        return []
+    rings = shapely.get_exterior_ring(np.asarray(polys, dtype=object))
+    coords = shapely.get_coordinates(rings).astype(np.int32)
+    return np.split(coords, np.cumsum(shapely.get_num_coordinates(rings))[:-1])
 
 # -----------------------------
 # Obstacles (shadows/objects & elevation edges)
@@ -115,15 +223,17 @@ def _obstacle_polys(
       - edge density (Canny + box filter),
       - gradient magnitude (Sobel), catching interior elevation boundaries.
     """
-    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
-    V = cv2.GaussianBlur(hsv[:, :, 2], (5, 5), 0)
-    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
-    gray = cv2.GaussianBlur(gray, (3, 3), 0)
-
-    vals = V[roof_mask > 0]
-    if vals.size == 0:
+    if cv2.countNonZero(roof_mask) == 0:
         return []
 
+    # The filter chain runs on UMat (OpenCL) when available; only cv2 ops touch it
+    src = cv2.UMat(bgr) if USE_OPENCL else bgr
+    roof_src = cv2.UMat(roof_mask) if USE_OPENCL else roof_mask
+    hsv = cv2.cvtColor(src, cv2.COLOR_BGR2HSV)
+    V_src = cv2.GaussianBlur(cv2.extractChannel(hsv, 2), (5, 5), 0)
+    gray = cv2.cvtColor(src, cv2.COLOR_BGR2GRAY)
+    gray = cv2.GaussianBlur(gray, (3, 3), 0)
+
     # thresholds (light mode is more conservative = fewer obstacles)
     q_dark = 0.30 if mode == "light" else 0.35
     edge_box = 5 if mode == "light" else 7
@@ -131,53 +241,56 @@ def _obstacle_polys(
     grad_q  = 0.88 if mode == "light" else 0.82  # high gradients treated as obstacles
 
     # 1) Dark/shadow mask
-    thr = np.quantile(vals, q_dark)
-    dark = (V < thr).astype(np.uint8) * 255
+    thr = _masked_quantile(_host(V_src), roof_mask, q_dark, 256)
+    dark = cv2.compare(V_src, float(thr), cv2.CMP_LT)
 
-    # 2) Edge-density mask
-    edges = cv2.Canny(V, 80, 160)
-    edges = cv2.bitwise_and(edges, roof_mask)
-    ed_density = cv2.boxFilter((edges > 0).astype(np.float32), ddepth=-1, ksize=(edge_box, edge_box))
-    ed_mask = (ed_density > edge_cut).astype(np.uint8) * 255
+    # 2) Edge-density mask (edges are 0/255, so the 0..1 density cut is scaled by 255)
+    edges = cv2.Canny(V_src, 80, 160)
+    edges = cv2.bitwise_and(edges, roof_src)
+    ed_density = cv2.boxFilter(edges, ddepth=cv2.CV_32F, ksize=(edge_box, edge_box))
+    ed_mask = cv2.compare(ed_density, edge_cut * 255.0, cv2.CMP_GT)
 
     # 3) Gradient magnitude (interior elevation edges)
     gx = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
     gy = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)
     mag = cv2.magnitude(gx, gy)
     # normalize inside roof only
-    mvals = mag[roof_mask > 0]
-    gthr = np.quantile(mvals, grad_q) if mvals.size else np.inf
-    grad_mask = ((mag >= gthr) & (roof_mask > 0)).astype(np.uint8) * 255
+    gthr = _masked_quantile(_host(mag), roof_mask, grad_q, GRAD_BINS)
+    grad_mask = cv2.compare(mag, float(gthr), cv2.CMP_GE)
 
     # Combine & keep only inside roof
     obst = cv2.bitwise_or(dark, ed_mask)
     obst = cv2.bitwise_or(obst, grad_mask)
-    obst = cv2.bitwise_and(obst, roof_mask)
+    obst = cv2.bitwise_and(obst, roof_src)
 
     # Remove tiny specks
-    num, labels, stats, _ = cv2.connectedComponentsWithStats(obst, connectivity=8)
-    keep = np.zeros_like(obst)
+    num, labels, stats, _ = cv2.connectedComponentsWithStats(_host(obst), connectivity=8)
     min_area_px = int((0.25 * px_per_m) ** 2)  # ≥25cm x 25cm
-    for i in range(1, num):
-        if stats[i, cv2.CC_STAT_AREA] >= min_area_px:
-            keep[labels == i] = 255
+    # Per-label keep value (background label 0 never kept), applied in one gather pass
+    keep_lut = np.where(stats[:, cv2.CC_STAT_AREA] >= min_area_px, 255, 0).astype(np.uint8)
+    keep_lut[0] = 0
+    keep = keep_lut[labels]
 
     # Dilate by clearance
     obs_px = max(1, int(round(obstacle_clearance_m * px_per_m)))
-    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2 * obs_px + 1, 2 * obs_px + 1))
-    keep = cv2.dilate(keep, kernel, iterations=1)
+    keep = _host(_dilate_ellipse(cv2.UMat(keep) if USE_OPENCL else keep, obs_px))
 
     # Polygons
     cnts, _ = cv2.findContours(keep, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    polys: List[Polygon] = []
+    approxes: List[np.ndarray] = []
     for c in cnts:
         if cv2.contourArea(c) < min_area_px:
             continue
         eps = 0.01 * cv2.arcLength(c, True)
         approx = cv2.approxPolyDP(c, eps, True).reshape(-1, 2)
         if len(approx) >= 3:
-            polys.append(Polygon(approx))
-    return polys
+            approxes.append(approx)
+    if not approxes:
+        return []
+    # One batched construction for all outlines (rings are closed automatically)
+    ring_ids = np.repeat(np.arange(len(approxes)), [len(a) for a in approxes])
+    rings = shapely.linearrings(np.concatenate(approxes).astype(np.float64), indices=ring_ids)
+    return list(shapely.polygons(rings))
 
 # -----------------------------
 # Packing helpers
@@ -189,10 +302,11 @@ def _pack_grid(
     target_area_px: float,
     offsets: List[Tuple[float, float]],
     overshoot_tol_area_px: float          # NEW
-) -> List[Polygon]:
+) -> Tuple[List[Polygon], float]:
     """
     Pack a centered grid fully inside `poly`, trying multiple offsets.
     Guarantees rows/cols >=1 if the span can hold a single panel.
+    Returns the panels and their total area.
     """
     minx, miny, maxx, maxy = poly.bounds
     step_x = pW_px + spacing_px
@@ -207,7 +321,7 @@ def _pack_grid(
     if avail_h >= pL_px:
         rows = 1 + int((avail_h - pL_px) // step_y)
     if cols <= 0 or rows <= 0:
-        return []
+        return [], 0.0
 
     used_w = cols * pW_px + (cols - 1) * spacing_px
     used_h = rows * pL_px + (rows - 1) * spacing_px
@@ -218,35 +332,37 @@ def _pack_grid(
     best_area = 0.0
     p_area = pW_px * pL_px                # NEW: single panel area
 
+    # Shrunk roof built and prepared once; every cell is tested in one vectorized call
+    inner = poly.buffer(-1e-6)
+    shapely.prepare(inner)
+
     for offx, offy in offsets:
-        placed: List[Polygon] = []
-        covered_px = 0.0
-        y = base_y + offy
-        for _ in range(rows):
-            x = base_x + offx
-            for _ in range(cols):
-                rect = box(x, y, x + pW_px, y + pL_px)
-
-                # respect hard cap: if placing this panel would overshoot "too much", skip it
-                if target_area_px > 0:
-                    next_area = covered_px + p_area
-                    if (next_area > target_area_px) and ((next_area - target_area_px) > overshoot_tol_area_px):
-                        x += step_x
-                        continue
-
-                if rect.within(poly.buffer(-1e-6)):
-                    placed.append(rect)
-                    covered_px += p_area
-                    if target_area_px > 0 and covered_px >= target_area_px:
-                        break
-                x += step_x
-            if target_area_px > 0 and covered_px >= target_area_px:
-                break
-            y += step_y
-        area = sum(r.area for r in placed)
+        # Cell origins accumulate step by step (row-major), exactly as a scan would
+        xs = np.cumsum(np.concatenate(([base_x + offx], np.full(cols - 1, step_x))))
+        ys = np.cumsum(np.concatenate(([base_y + offy], np.full(rows - 1, step_y))))
+        X, Y = np.meshgrid(xs, ys)
+        rects = shapely.box(X.ravel(), Y.ravel(), X.ravel() + pW_px, Y.ravel() + pL_px)
+        # Prepared contains_properly only needs a point-in-polygon probe plus a segment
+        # crossing test; it differs from within() only for cells touching the 1e-6 ring
+        fits = np.flatnonzero(shapely.contains_properly(inner, rects))
+
+        # Panels are taken in scan order until the next one would overshoot the
+        # target by more than the tolerance (skipped, as are all later cells), or
+        # the target is reached
+        n_take = len(fits)
+        if target_area_px > 0 and n_take:
+            # running coverage accumulated panel by panel, as the scan adds them
+            covered = np.cumsum(np.full(n_take, p_area))
+            reached = np.flatnonzero(covered >= target_area_px)
+            if reached.size:
+                k = int(reached[0])
+                overshoot = covered[k] - target_area_px
+                n_take = k if (covered[k] > target_area_px and overshoot > overshoot_tol_area_px) else k + 1
+        placed = list(rects[fits[:n_take]])
+        area = sum(shapely.area(placed).tolist())
         if area > best_area:
             best, best_area = placed, area
-    return best
+    return best, best_area
 
 # -----------------------------
 # Try one angle/orientation combo
@@ -297,13 +413,13 @@ def _try_angle_pack(
         placed_all: List[Polygon] = []
         remaining = target_area_px
         for part in parts:
-            placed = _pack_grid(
+            placed, placed_area = _pack_grid(
                 part, pW_px, pL_px, spacing_px,
                 remaining, offsets,
                 overshoot_tol_area_px = (pW_px * pL_px * overshoot_tolerance_frac)
             )
             placed_all.extend(placed)
-            remaining -= sum(r.area for r in placed)
+            remaining -= placed_area
             if remaining <= 0:
                 break
         return placed_all
@@ -311,23 +427,27 @@ def _try_angle_pack(
     Lm, Wm = panel_dims_m
     placed_p = pack_all_parts(Wm * px_per_m, Lm * px_per_m)
     placed_l = pack_all_parts(Lm * px_per_m, Wm * px_per_m)
+    # one batched area call per orientation, summed in panel order
+    area_p = float(sum(shapely.area(placed_p).tolist()))
+    area_l = float(sum(shapely.area(placed_l).tolist()))
 
-    if sum(r.area for r in placed_l) > sum(r.area for r in placed_p):
+    if area_l > area_p:
         placed = placed_l
         dims_used = (Wm, Lm)
+        placed_area_px = area_l
     else:
         placed = placed_p
         dims_used = (Lm, Wm)
+        placed_area_px = area_p
 
-    placed_back = [affinity.rotate(p, angle_deg, origin=rot_center, use_radians=False) for p in placed]
-    placed_area_px = float(sum(p.area for p in placed))
+    placed_back = _rotate_many(placed, angle_deg, rot_center)
     return placed_back, dims_used, usable_area_px, placed_area_px, target_area_px
 
 # -----------------------------
 # Main entry
 # -----------------------------
 def layout_panels(
-    img: Image.Image,
+    img: Union[Image.Image, np.ndarray],
     roof_area_m2: float,
     roof_length_m: Optional[float] = None,
     roof_width_m: Optional[float] = None,
@@ -353,6 +473,7 @@ def layout_panels(
     # 1) roof mask & polygon
     mask, contour = _largest_contour_mask(gray)
     roof_poly = _contour_polygon(contour)
+    roof_area_px = float(cv2.countNonZero(mask))  # pixel scale + roof-relative targeting
 
     # 2) infer L/W if missing
     if roof_length_m is None or roof_width_m is None:
@@ -361,72 +482,78 @@ def layout_panels(
         roof_width_m  = est_W if roof_width_m is None else roof_width_m
 
     # 3) pixel scale
-    m_per_px = _m_per_px_from_area(roof_area_m2, mask)
+    m_per_px = _m_per_px_from_area(roof_area_m2, roof_area_px)
     px_per_m = 1.0 / m_per_px
 
     # 4) angles to try
     roof_axis = _roof_orientation_deg(contour)
-    angles_to_try: List[float] = []
-    if params.angle_deg is not None:
-        angles_to_try.extend([params.angle_deg, params.angle_deg + 90, params.angle_deg + 5, params.angle_deg - 5])
-    angles_to_try.extend([roof_axis, roof_axis + 90, roof_axis + 5, roof_axis - 5])
-    angles_to_try = [((a % 180) + 180) % 180 for a in angles_to_try]
+    # axis-aligned candidates first; the +/-5 deg jitter only runs if they miss the target
+    base_angles = ([params.angle_deg] if params.angle_deg is not None else []) + [roof_axis]
+    primary_angles = [((a % 180) + 180) % 180 for b in base_angles for a in (b, b + 90)]
+    jitter_angles = [((a % 180) + 180) % 180 for b in base_angles for a in (b + 5, b - 5)]
 
     # 5) effective boundary ring (parapet band)
     edge_clearance_m_eff = max(params.edge_clearance_m, params.min_boundary_clearance_m)
 
-    # 6) obstacle polygons (with fallbacks)
-    def rotated_obs_union(angle: float) -> Optional[Polygon]:
-        if params.obstacle_mode == "off":
-            return None
+    # 6) obstacle polygons (with fallbacks); detection does not depend on the angle, so it runs once
+    obs_img: List[Polygon] = []
+    if params.obstacle_mode != "off":
         modes = ["auto", "light"] if params.obstacle_mode == "auto" else [params.obstacle_mode]
-        obs_img: List[Polygon] = []
         for m in modes:
             obs_img = _obstacle_polys(bgr, mask, px_per_m, params.obstacle_clearance_m, mode=m)
             if obs_img:
                 break
+    if obs_img:
+        # Every rotated/shrunk roof lies inside roof_poly, so obstacles whose envelope
+        # misses it can never cut the usable area (envelopes only: obstacles may be invalid)
+        tree = shapely.STRtree(obs_img)
+        obs_img = [obs_img[i] for i in np.sort(tree.query(roof_poly))]
+
+    def rotated_obs_union(angle: float) -> Optional[Polygon]:
         if not obs_img:
             return None
-        obs_rot = [affinity.rotate(p, -angle, origin=(mask.shape[1]/2.0, mask.shape[0]/2.0), use_radians=False)
-                   for p in obs_img]
-        return unary_union([p.buffer(0) for p in obs_rot])
+        obs_rot = _rotate_many(obs_img, -angle, (mask.shape[1]/2.0, mask.shape[0]/2.0))
+        return unary_union(shapely.buffer(obs_rot, 0))
 
     # 7) packing loop over angles
     spec = PANEL_SPECS[params.panel_size]
     Lm, Wm = spec["L_m"], spec["W_m"]
     spacing_px = params.spacing_m * px_per_m
     rot_center = (mask.shape[1] / 2.0, mask.shape[0] / 2.0)
-    roof_area_px = float(cv2.countNonZero(mask))  # for roof-relative targeting
 
     best_panels: List[Polygon] = []
     best_dims_used: Tuple[float, float] = (Lm, Wm)
-    best_angle_used: float = angles_to_try[0] if angles_to_try else 0.0
+    best_angle_used: float = primary_angles[0]
     best_usable_px = 0.0
     best_placed_px  = 0.0
     best_target_px  = 0.0
     best_delta      = float("inf")
 
-    for angle in angles_to_try:
+    # obstacle shrink amounts tried, in order, when obstacles swallow too much roof
+    relax_steps_px = [(params.obstacle_clearance_m * px_per_m) * (1.0 - frac) for frac in (0.75, 0.5, 0.25, 0.0)]
+
+    def evaluate_angle(angle: float):
         obs_union = rotated_obs_union(angle)
+        angle_warnings: List[str] = []
 
         def subtractor(poly_rot: Polygon) -> Polygon:
             if obs_union is None:
                 return poly_rot
             usable = poly_rot.difference(obs_union)
-            if usable.is_empty or usable.area < 0.12 * poly_rot.area:
+            min_usable_px = 0.12 * poly_rot.area
+            if usable.is_empty or usable.area < min_usable_px:
                 # relax: shrink obstacle influence
-                for frac in (0.75, 0.5, 0.25, 0.0):
-                    relax_px = (params.obstacle_clearance_m * px_per_m) * (1.0 - frac)
+                for relax_px in relax_steps_px:
                     usable = poly_rot.difference(obs_union.buffer(-relax_px))
-                    if not usable.is_empty and usable.area >= 0.12 * poly_rot.area:
-                        warnings.append("Obstacle mask relaxed to retain sufficient usable area.")
+                    if not usable.is_empty and usable.area >= min_usable_px:
+                        angle_warnings.append("Obstacle mask relaxed to retain sufficient usable area.")
                         break
                 if usable.is_empty:
-                    warnings.append("Obstacle mask disabled (covered nearly whole roof).")
+                    angle_warnings.append("Obstacle mask disabled (covered nearly whole roof).")
                     usable = poly_rot
             return usable
 
-        placed, dims_used, usable_px, placed_px, target_px = _try_angle_pack(
+        packed = _try_angle_pack(
             roof_poly=roof_poly,
             rot_center=rot_center,
             angle_deg=angle,
@@ -440,13 +567,40 @@ def layout_panels(
             fill_relative_to=params.fill_relative_to,
             overshoot_tolerance_frac=params.overshoot_tolerance_frac
         )
-
-        # choose the angle whose packed area is closest to the target
-        delta = abs(placed_px - target_px)
-        if delta < best_delta:
-            best_panels, best_dims_used, best_angle_used = placed, dims_used, angle
-            best_usable_px, best_placed_px, best_target_px = usable_px, placed_px, target_px
-            best_delta = delta
+        return packed, angle_warnings
+
+    def run_trials(angles: List[float]) -> bool:
+        """Evaluate angles in order, keeping the best; True once one lands within tolerance."""
+        nonlocal best_panels, best_dims_used, best_angle_used
+        nonlocal best_usable_px, best_placed_px, best_target_px, best_delta
+        # Trials are independent; results are consumed in angle order either way.
+        # On the pool, trials already running when one hits the target finish and
+        # are discarded; the queued ones are cancelled.
+        if _ANGLE_POOL is not None and len(angles) > 1:
+            futures = [_ANGLE_POOL.submit(evaluate_angle, a) for a in angles]
+        else:
+            futures = None
+        try:
+            for i, angle in enumerate(angles):
+                packed, angle_warnings = futures[i].result() if futures else evaluate_angle(angle)
+                placed, dims_used, usable_px, placed_px, target_px = packed
+                warnings.extend(angle_warnings)
+
+                # choose the angle whose packed area is closest to the target
+                delta = abs(placed_px - target_px)
+                if delta < best_delta:
+                    best_panels, best_dims_used, best_angle_used = placed, dims_used, angle
+                    best_usable_px, best_placed_px, best_target_px = usable_px, placed_px, target_px
+                    best_delta = delta
+                if delta < params.target_tolerance_frac * target_px:
+                    return True
+            return False
+        finally:
+            for f in futures or ():
+                f.cancel()
+
+    if not run_trials(primary_angles):
+        run_trials(jitter_angles)
 
     # Last-resort: if still nothing, gently relax spacing & ring (never below 0.3 m ring)
     if not best_panels:
@@ -468,7 +622,7 @@ def layout_panels(
         best_panels, best_dims_used, best_angle_used = placed, dims_used, roof_axis
         best_usable_px, best_placed_px, best_target_px = usable_px, placed_px, target_px
 
-    polys_xy = [_poly_to_int_xy(p) for p in best_panels]
+    polys_xy = _polys_to_int_xy(best_panels)
 
     # draw overlay
     overlay = bgr.copy()
@@ -549,7 +703,7 @@ def layout_panels(
 # Convenience wrapper
 # -----------------------------
 def get_solar_layout(
-    image: Image.Image,
+    image: Union[Image.Image, np.ndarray],
     area_m2: float,
     length_m: Optional[float] = None,
     width_m: Optional[float] = None,
@@ -2,50 +2,58 @@
 Rooftop detection wrapper module for main.py compatibility
 """
 
+from typing import Optional, Union
+
 import numpy as np
 from PIL import Image
 import cv2
 import rooftop as rooftop_mod
 
-def get_roof_data(image: Image.Image) -> dict:
+# Typical roof color ranges in OpenCV HSV (can be expanded based on common roof materials)
+GRAY_ROOF_HSV = (np.array([0, 0, 50]), np.array([180, 30, 200]))     # gray/black roofs
+BROWN_ROOF_HSV = (np.array([0, 30, 50]), np.array([20, 255, 200]))   # brown/red tiles
+ROOF_MASK_KERNEL = np.ones((5, 5), np.uint8)                          # close/open cleanup
+
+# Simple yield model: 5.5 peak sun hours a day at 85% system efficiency
+SYSTEM_EFFICIENCY = 0.85
+AVG_DAILY_SUN_HOURS = 5.5
+ANNUAL_KWH_PER_KW = AVG_DAILY_SUN_HOURS * 365 * SYSTEM_EFFICIENCY
+
+def get_roof_data(image: Union[Image.Image, np.ndarray], return_overlay: bool = False) -> dict:
     """
-    Extract roof area from image using more accurate estimation
+    Extract roof area from image using more accurate estimation.
+    Accepts a PIL image (RGB) or an OpenCV BGR array.
+    The masked roof_detection_image is only rendered when return_overlay is set.
     """
-    # Convert PIL to numpy array
-    img_array = np.array(image)
+    if isinstance(image, np.ndarray):
+        img_array = image
+        to_hsv = cv2.COLOR_BGR2HSV
+    else:
+        # Read-only view of PIL's buffer (one copy instead of two); nothing below writes to it,
+        # and cvtColor drops an alpha channel itself
+        img_array = np.asarray(image)
+        to_hsv = cv2.COLOR_RGB2HSV
     
     # Get image dimensions
     height, width = img_array.shape[:2]
     image_area_pixels = height * width
     
+    roof_overlay = None
     try:
         # Use color segmentation to identify roof area
+        # (on the OpenCL device when rooftop enables it; countNonZero reads the UMat directly)
+        src = cv2.UMat(img_array) if rooftop_mod.USE_OPENCL else img_array
         # Convert to HSV color space for better segmentation
-        img_hsv = cv2.cvtColor(img_array, cv2.COLOR_RGB2HSV)
+        img_hsv = cv2.cvtColor(src, to_hsv)
         
-        # Typical roof color ranges (can be expanded based on common roof materials)
         # This targets common roof colors like gray, brown, red tiles, etc.
-        roof_masks = []
-        
-        # Gray/black roofs
-        gray_lower = np.array([0, 0, 50])
-        gray_upper = np.array([180, 30, 200])
-        roof_masks.append(cv2.inRange(img_hsv, gray_lower, gray_upper))
-        
-        # Brown/red roofs
-        brown_lower = np.array([0, 30, 50])
-        brown_upper = np.array([20, 255, 200])
-        roof_masks.append(cv2.inRange(img_hsv, brown_lower, brown_upper))
-        
-        # Combine masks
-        roof_mask = np.zeros_like(roof_masks[0])
-        for mask in roof_masks:
-            roof_mask = cv2.bitwise_or(roof_mask, mask)
+        # (gray/black mask, then brown/red ORed into it in place)
+        roof_mask = cv2.inRange(img_hsv, *GRAY_ROOF_HSV)
+        cv2.bitwise_or(roof_mask, cv2.inRange(img_hsv, *BROWN_ROOF_HSV), dst=roof_mask)
         
         # Apply morphological operations to clean up the mask
-        kernel = np.ones((5, 5), np.uint8)
-        roof_mask = cv2.morphologyEx(roof_mask, cv2.MORPH_CLOSE, kernel)
-        roof_mask = cv2.morphologyEx(roof_mask, cv2.MORPH_OPEN, kernel)
+        roof_mask = cv2.morphologyEx(roof_mask, cv2.MORPH_CLOSE, ROOF_MASK_KERNEL)
+        roof_mask = cv2.morphologyEx(roof_mask, cv2.MORPH_OPEN, ROOF_MASK_KERNEL)
         
         # Calculate roof area in pixels
         roof_pixels = cv2.countNonZero(roof_mask)
@@ -60,14 +68,15 @@ def get_roof_data(image: Image.Image) -> dict:
             estimated_roof_area_m2 = 50.0 + roof_ratio * 150.0
             estimated_roof_area_m2 = min(300.0, max(50.0, estimated_roof_area_m2))
             
-        # Create debug image for visualization
-        debug_image = img_array.copy()
-        roof_overlay = cv2.bitwise_and(img_array, img_array, mask=roof_mask)
+        # Debug image for visualization (masked copy onto zeros: one read of the image)
+        if return_overlay:
+            roof_overlay = rooftop_mod._host(cv2.copyTo(src, roof_mask))
         
     except Exception as e:
         # Fallback to basic estimation if CV operations fail
         estimated_roof_area_m2 = min(200.0, max(50.0, image_area_pixels / 10000))
-        roof_overlay = img_array
+        if return_overlay:
+            roof_overlay = img_array
         
     return {
         "roof_area": estimated_roof_area_m2,
@@ -76,12 +85,14 @@ def get_roof_data(image: Image.Image) -> dict:
         "roof_detection_image": roof_overlay
     }
 
-def get_solar_data(image: Image.Image) -> dict:
+def get_solar_data(image: Union[Image.Image, np.ndarray], roof_data: Optional[dict] = None) -> dict:
     """
     Get solar panel layout data from image
+    (pass roof_data when get_roof_data has already run on the same image)
     """
     # 1) Estimate roof area first (pixels->m² approximation)
-    roof_data = get_roof_data(image)
+    if roof_data is None:
+        roof_data = get_roof_data(image)
     roof_area_m2 = float(roof_data["roof_area"])
 
     # 2) Use advanced layout algorithm to generate real panel placement and annotated image
@@ -110,9 +121,7 @@ def get_solar_data(image: Image.Image) -> dict:
     total_power_kw = float(stats.get("capacity_estimated_kWp", 0.0))
 
     # 4) Keep a simple annual energy estimate (can be refined later)
-    system_efficiency = 0.85
-    avg_daily_sun_hours = 5.5
-    annual_energy_kwh = total_power_kw * avg_daily_sun_hours * 365 * system_efficiency
+    annual_energy_kwh = total_power_kw * ANNUAL_KWH_PER_KW
 
     return {
         "area_of_panels": actual_panel_area,
@@ -124,7 +133,7 @@ def get_solar_data(image: Image.Image) -> dict:
         "panel_model": panel_model,
     }
 
-def get_rainwater_data(image: Image.Image) -> dict:
+def get_rainwater_data(image: Union[Image.Image, np.ndarray]) -> dict:
     """
     Get rainwater harvesting relevant data from roof image
     """
@@ -135,3 +144,12 @@ def get_rainwater_data(image: Image.Image) -> dict:
         "roof_area": roof_data["roof_area"],
         "catchment_area": roof_data["roof_area"]  # Same as roof area for rainwater
     }
+
+def warm_up() -> None:
+    """
+    Run one small synthetic analysis so OpenCV/shapely are loaded and initialised
+    before the first real request (the pipeline has no model weights to preload)
+    """
+    image = np.zeros((128, 128, 3), np.uint8)
+    image[24:104, 16:112] = 170
+    get_solar_data(image)